@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import crud_async
+from cache import user_cache
+from catalog.store import load_catalog
+from storage.backend import get_backend
+from main import app
+
+### --- p99 latency under mixed load: blocking crud vs crud_async executor --- ###
+# Usage: python benchmarks/bench_async_io.py [--rate 300] [--requests 2000] [--io-delay 2]
+# --io-delay simulates a slow disk (ms added to every account read), e.g. a network volume.
+
+MIX = [
+    ("GET", "/user_profile"),
+    ("GET", "/user_home"),
+    ("GET", "/details/2512"),
+    ("GET", "/api/roles/1111/children"),
+    ("POST", "/extract_skill_models"),
+]
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+async def run_load(rate: float, total: int, username: str) -> list[float]:
+    """
+    Open-loop load: request i is due at start + i / rate, and its latency is measured from
+    that moment, so time spent waiting for a blocked event loop is counted too.
+    """
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", cookies={"session_token": username}) as client:
+        loop_start = time.perf_counter()
+
+        async def one_request(i: int):
+            due = loop_start + i / rate
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+            method, url = MIX[i % len(MIX)]
+            if method == "POST":
+                await client.post(url, data={"search": "Engineer"})
+            else:
+                await client.get(url)
+            latencies.append((time.perf_counter() - due) * 1000)
+
+        await asyncio.gather(*(one_request(i) for i in range(total)))
+
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=300, help="requests per second")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--io-delay", type=float, default=2.0)
+    parser.add_argument("--user", default="alfa")
+    args = parser.parse_args()
+
+    load_catalog()
+
+    # every request reads the profile from storage (no principal cache)
+    user_cache.maxsize = 0
+
+    backend = get_backend()
+    original_get = backend.get
+    def slow_get(kind, name):
+        time.sleep(args.io_delay / 1000)
+        return original_get(kind, name)
+    backend.get = slow_get
+
+    print(f"{args.requests} requests at {args.rate:.0f} req/s, io delay {args.io_delay} ms\n")
+    print(f"{'mode':<28}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+
+    for label, workers in (("before (blocking, inline)", 0), (f"after (executor, {args.workers})", args.workers)):
+        crud_async.set_workers(workers)
+        start = time.perf_counter()
+        latencies = asyncio.run(run_load(args.rate, args.requests, args.user))
+        elapsed = time.perf_counter() - start
+
+        print(f"{label:<28}{len(latencies) / elapsed:>10.0f}{percentile(latencies, 50):>10.2f}"
+              f"{percentile(latencies, 95):>10.2f}{percentile(latencies, 99):>10.2f}")
+
+if __name__ == "__main__":
+    main()
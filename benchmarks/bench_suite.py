@@ -0,0 +1,239 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from benchmarks.synthetic_data import DEFAULT_ROOT, BENCH_PASSWORD
+
+### --- crud micro-benchmarks and in-process load scenarios --- ###
+# Usage:
+#   python benchmarks/synthetic_data.py                     (once: users, orgs, big workbook)
+#   python benchmarks/bench_suite.py [--only micro|load] [--output FILE] [--compare OLD_FILE]
+# The app runs with the synthetic root as working directory, the real data/ is never touched.
+# Results (req/s or ops/s, p50/p95/p99 in ms) are written as JSON, one file per run.
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    # latencies in seconds
+    ms = [latency * 1000 for latency in latencies]
+    return {
+        "n": len(ms),
+        "per_second": round(len(ms) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(ms) / len(ms), 4),
+        "p50_ms": round(percentile(ms, 50), 4),
+        "p95_ms": round(percentile(ms, 95), 4),
+        "p99_ms": round(percentile(ms, 99), 4)
+    }
+
+### --- Micro-benchmarks: one crud function at a time --- ###
+def micro_benchmarks(iterations: int, rng: random.Random) -> dict:
+    import crud
+    from cache import gap_cache
+    from catalog.store import get_catalog
+
+    catalog = get_catalog()
+    codes = [role.id for role in catalog.roles]
+    titles = [role.title for role in catalog.roles]
+    words = sorted({word for title in titles[:2000] for word in title.split() if len(word) > 3})
+    usernames = sorted(name[:-5] for name in os.listdir("data/users") if name.endswith(".json"))
+    orgnames = sorted(name[:-5] for name in os.listdir("data/organizations") if name.endswith(".json"))
+    users = [crud.get_user(name) for name in rng.sample(usernames, min(200, len(usernames)))]
+    run_id = time.time_ns()
+    created = iter(range(1 << 30))
+
+    def create_user(i):
+        from models import User
+        crud.create_user(User(name="Bench", surname="Micro", email="micro@example.com",
+                              username=f"micro{run_id}-{next(created)}", hashed_password=users[0].hashed_password))
+
+    def warm_skill_gaps():
+        # every timed user in gap_cache first: the set_* cases above have just invalidated their reports
+        for user in users:
+            crud.get_skill_gap(user)
+
+    def skill_gap_cold(i):
+        gap_cache.clear()
+        crud.get_skill_gap(users[i % len(users)])
+
+    cases = {
+        "get_user": lambda i: crud.get_user(rng.choice(usernames)),
+        "create_user": create_user,
+        "set_target_roles_user": lambda i: crud.set_target_roles_user(users[i % len(users)], rng.sample(words, 2)),
+        "set_skills_user": lambda i: crud.set_skills_user(users[i % len(users)], users[i % len(users)].skills or {}),
+        "change_password_user": lambda i: crud.change_password_user(users[i % len(users)], users[i % len(users)].hashed_password),
+        "get_organization": lambda i: crud.get_organization(rng.choice(orgnames)),
+        "extracting_skill_models": lambda i: crud.extracting_skill_models(rng.choice(words)),
+        "extracting_skill_models_page": lambda i: crud.extracting_skill_models_page(rng.choice(words), 0, 20),
+        "extracting_target_roles": lambda i: crud.extracting_target_roles(rng.sample(words, 3)),
+        "autocomplete_roles": lambda i: crud.autocomplete_roles(rng.choice(words)[:rng.randint(1, 4)]),
+        "get_role_by_id": lambda i: crud.get_role_by_id(rng.choice(codes)),
+        "get_role_children": lambda i: crud.get_role_children(rng.choice(codes)),
+        "get_role_ancestors": lambda i: crud.get_role_ancestors(rng.choice(codes)),
+        "get_similar_roles": lambda i: crud.get_similar_roles(rng.choice(codes)),
+        "get_role_skills": lambda i: crud.get_role_skills(rng.choice(codes)),
+        "get_skill_gap (cached)": lambda i: crud.get_skill_gap(users[i % len(users)]),
+        "get_skill_gap (cold)": skill_gap_cold,
+    }
+    if orgnames:
+        orgs = [crud.get_organization(name) for name in orgnames]
+        crud.get_org_analytics(orgs[0]) # builds the first snapshot outside the timing
+        cases["get_org_analytics"] = lambda i: crud.get_org_analytics(orgs[0])
+
+    warm_ups = {"get_skill_gap (cached)": warm_skill_gaps}
+
+    results = {}
+    for name, func in cases.items():
+        if name in warm_ups:
+            warm_ups[name]()
+        else:
+            func(0) # warm-up
+        latencies = []
+        start = time.perf_counter()
+        for i in range(iterations):
+            call_start = time.perf_counter()
+            func(i)
+            latencies.append(time.perf_counter() - call_start)
+        results[name] = summarize(latencies, time.perf_counter() - start)
+        print(f"  {name:<32}{results[name]['per_second']:>12.0f}/s{results[name]['p50_ms']:>10.3f}{results[name]['p99_ms']:>10.3f}")
+    return results
+
+### --- Load scenarios: whole requests through the ASGI app --- ###
+async def run_scenario(app, build_request, total: int, concurrency: int, cookies: dict) -> dict:
+    """
+    Closed loop: `concurrency` clients send requests back to back until `total` are done.
+    """
+    import httpx
+
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    counter = iter(range(total))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", cookies=cookies) as client:
+        async def worker():
+            for i in counter:
+                method, url, kwargs = build_request(i)
+                start = time.perf_counter()
+                response = await client.request(method, url, follow_redirects=False, **kwargs)
+                latencies.append(time.perf_counter() - start)
+                statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {**summarize(latencies, elapsed), "statuses": statuses}
+
+def load_benchmarks(requests: int, concurrency: int, rng: random.Random) -> dict:
+    from main import app
+    from catalog.store import load_catalog
+    from skills.store import load_skill_store
+
+    catalog = load_catalog()
+    load_skill_store()
+    codes = [role.id for role in catalog.roles]
+    titles = [role.title for role in catalog.roles]
+    words = sorted({word for title in titles[:2000] for word in title.split() if len(word) > 3})
+    usernames = sorted(name[:-5] for name in os.listdir("data/users") if name.endswith(".json") and name.startswith("user"))
+    session = {"session_token": usernames[0]}
+
+    scenarios = {
+        # Argon2 dominates: fewer requests
+        "login": (max(20, requests // 10), lambda i: ("POST", "/user_login", {"data": {"username": rng.choice(usernames), "password": BENCH_PASSWORD}})),
+        "search": (requests, lambda i: ("POST", "/extract_skill_models", {"data": {"search": rng.choice(words)}})),
+        "details": (requests, lambda i: ("GET", f"/details/{rng.choice(codes)}", {})),
+        "set_target_roles": (requests, lambda i: ("POST", "/set_target_roles", {"data": {"role1": rng.choice(words), "role2": rng.choice(words)}})),
+        "autocomplete": (requests, lambda i: ("GET", "/api/roles/autocomplete", {"params": {"q": rng.choice(words)[:3]}})),
+        "search_api": (requests, lambda i: ("GET", "/api/search", {"params": {"q": rng.choice(words)}})),
+    }
+
+    results = {}
+    for name, (total, build_request) in scenarios.items():
+        results[name] = asyncio.run(run_scenario(app, build_request, total, concurrency, session))
+        r = results[name]
+        print(f"  {name:<32}{r['per_second']:>12.0f}/s{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}  {r['statuses']}")
+    return results
+
+### --- Run metadata and comparison --- ###
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def compare(old: dict, new: dict):
+    print(f"\n{'benchmark':<40}{'old p50':>10}{'new p50':>10}{'old p99':>10}{'new p99':>10}{'rate x':>8}")
+    for section in ("micro", "load"):
+        for name, result in new.get(section, {}).items():
+            before = old.get(section, {}).get(name)
+            if not before:
+                continue
+            ratio = result["per_second"] / before["per_second"] if before["per_second"] else 0.0
+            print(f"{section + '/' + name:<40}{before['p50_ms']:>10.3f}{result['p50_ms']:>10.3f}"
+                  f"{before['p99_ms']:>10.3f}{result['p99_ms']:>10.3f}{ratio:>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="crud micro-benchmarks and in-process load scenarios")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="synthetic dataset (benchmarks/synthetic_data.py)")
+    parser.add_argument("--only", choices=["micro", "load"])
+    parser.add_argument("--iterations", type=int, default=500, help="calls per micro-benchmark")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per load scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="previous JSON results to compare with")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.root, "manifest.json")):
+        sys.exit(f"No synthetic dataset in {args.root}: run python benchmarks/synthetic_data.py first")
+
+    output = args.output or os.path.join(REPO, "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    output = os.path.abspath(output)
+    compare_with = os.path.abspath(args.compare) if args.compare else None
+
+    with open(os.path.join(args.root, "manifest.json"), "r") as f:
+        manifest = json.load(f)
+    os.chdir(args.root)
+
+    results = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "dataset": manifest,
+            "args": vars(args)
+        }
+    }
+
+    rng = random.Random(args.seed)
+    if args.only in (None, "micro"):
+        print(f"{'crud micro-benchmarks':<34}{'rate':>14}{'p50 ms':>10}{'p99 ms':>10}")
+        results["micro"] = micro_benchmarks(args.iterations, rng)
+    if args.only in (None, "load"):
+        print(f"{f'load (concurrency {args.concurrency})':<34}{'rate':>14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        results["load"] = load_benchmarks(args.requests, args.concurrency, rng)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"\nResults written to {output}")
+
+    if compare_with:
+        with open(compare_with, "r") as f:
+            compare(json.load(f), results)
+
+if __name__ == "__main__":
+    main()
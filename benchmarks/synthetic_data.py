@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import random
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+import pandas as pd
+
+DEFAULT_ROOT = os.path.join(REPO, "benchmarks", ".synthetic")
+BENCH_PASSWORD = "benchmark" # every synthetic account uses it (one Argon2 hash, computed once)
+WORKBOOK_NAME = "ISCO-08 EN Structure and definitions.xlsx"
+
+### --- Synthetic dataset in the data/ layout --- ###
+# Usage: python benchmarks/synthetic_data.py [--users 10000] [--orgs 50] [--roles 5000] [--root DIR]
+# DIR gets data/users, data/organizations, data/<workbook>, skill_models.json, and links to
+# templates/ and static/, so the app can run with DIR as working directory.
+
+def synthetic_codes(count: int) -> list[str]:
+    """
+    ISCO-like codes nesting by prefix (1 -> 11 -> 111 -> 1111 ...), grown breadth first
+    up to `count` codes, returned in workbook (depth-first) order.
+    """
+    codes = [str(major) for major in range(1, 10)][:count]
+    frontier = list(codes)
+    while len(codes) < count:
+        next_frontier = []
+        for parent in frontier:
+            for digit in range(10):
+                if len(codes) >= count:
+                    break
+                code = f"{parent}{digit}"
+                codes.append(code)
+                next_frontier.append(code)
+        frontier = next_frontier
+    return sorted(codes)
+
+def synthetic_workbook(source: str, count: int, rng: random.Random) -> pd.DataFrame:
+    # text recycled from the real workbook, so tokens and lengths stay realistic
+    real = pd.read_excel(source, usecols="B,C,D,E", dtype=str).fillna("")
+    real.columns = ["id", "title", "definition", "task"]
+    rows = real.to_dict("records")
+
+    records = []
+    for i, code in enumerate(synthetic_codes(count)):
+        model = rows[i % len(rows)] if i < len(rows) else rng.choice(rows)
+        title = model["title"] if i < len(rows) else f"{model['title']} {i // len(rows) + 1}"
+        records.append({
+            "Level": str(min(len(code), 4)),
+            "ISCO 08 Code": code,
+            "Title EN": title,
+            "Definition": model["definition"],
+            "Tasks include": model["task"]
+        })
+    return pd.DataFrame(records)
+
+def synthetic_skill_models(workbook: pd.DataFrame, skills: int, rng: random.Random) -> dict:
+    vocabulary = [f"Skill {i:04d}" for i in range(skills)]
+    models = {}
+    for code, title in zip(workbook["ISCO 08 Code"], workbook["Title EN"]):
+        models[code] = [
+            {"Role Title": title, "Skill": skill, "Required Level": rng.randint(2, 9), "Reason": "Synthetic requirement"}
+            for skill in rng.sample(vocabulary, rng.randint(4, 10))
+        ]
+    return models
+
+def write_json(path: str, data: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+
+def generate(root: str, users: int, orgs: int, roles: int, skills: int, seed: int = 42) -> dict:
+    from config import pwd_context
+
+    rng = random.Random(seed)
+    data_dir = os.path.join(root, "data")
+    for folder in ("users", "organizations"):
+        os.makedirs(os.path.join(data_dir, folder), exist_ok=True)
+
+    # the app resolves templates/, static/ and data/ from the working directory
+    for folder in ("templates", "static"):
+        link = os.path.join(root, folder)
+        if not os.path.exists(link):
+            os.symlink(os.path.join(REPO, folder), link)
+
+    workbook = synthetic_workbook(os.path.join(REPO, "data", WORKBOOK_NAME), roles, rng)
+    workbook.to_excel(os.path.join(data_dir, WORKBOOK_NAME), index=False)
+    skill_models = synthetic_skill_models(workbook, skills, rng)
+    write_json(os.path.join(root, "skill_models.json"), skill_models)
+
+    titles = workbook["Title EN"].tolist()
+    vocabulary = sorted({record["Skill"] for records in skill_models.values() for record in records})
+    hashed = pwd_context.hash(BENCH_PASSWORD)
+
+    usernames = []
+    for i in range(users):
+        username = f"user{i:06d}"
+        usernames.append(username)
+        write_json(os.path.join(data_dir, "users", f"{username}.json"), {
+            "name": "Bench",
+            "surname": f"User {i}",
+            "username": username,
+            "email": f"{username}@example.com",
+            "hashed_password": hashed,
+            "target_roles": rng.sample(titles, rng.randint(1, 3)),
+            "skills": {skill: rng.randint(1, 9) for skill in rng.sample(vocabulary, min(len(vocabulary), rng.randint(3, 12)))},
+            "organizations": [f"org{i % orgs:04d}"] if orgs else [] # invitation already accepted
+        })
+
+    # members split evenly between the organizations
+    for j in range(orgs):
+        orgname = f"org{j:04d}"
+        write_json(os.path.join(data_dir, "organizations", f"{orgname}.json"), {
+            "name": f"Bench Organization {j}",
+            "address": "Via Synthetic 1, Verona",
+            "phone": "0450000000",
+            "email": f"{orgname}@example.com",
+            "orgname": orgname,
+            "hashed_password": hashed,
+            "members": usernames[j::orgs]
+        })
+
+    manifest = {"users": users, "orgs": orgs, "roles": roles, "skills": len(vocabulary), "seed": seed, "password": BENCH_PASSWORD}
+    write_json(os.path.join(root, "manifest.json"), manifest)
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic users, organizations and ISCO workbook for benchmarks")
+    parser.add_argument("--root", default=DEFAULT_ROOT)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--orgs", type=int, default=50)
+    parser.add_argument("--roles", type=int, default=5000, help="rows of the synthetic workbook")
+    parser.add_argument("--skills", type=int, default=2000, help="size of the skill vocabulary")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    manifest = generate(args.root, args.users, args.orgs, args.roles, args.skills, args.seed)
+    print(f"Synthetic data written to {args.root}: {manifest}")
+
+if __name__ == "__main__":
+    main()
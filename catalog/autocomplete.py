@@ -0,0 +1,103 @@
+import re
+import unicodedata
+from bisect import bisect_left
+import numpy as np
+from catalog.shared import StringArray, save_array, load_array
+
+SPACES_RE = re.compile(r"\s+")
+SHORT_PREFIX = 2 # answers for prefixes up to this length are memoized (their ranges are the widest)
+MEMO_ROWS = 50 # rows kept per memoized prefix (the API limit), larger limits are computed
+ARRAYS = ("kinds", "ranks", "rows")
+
+def normalize_title(text: str) -> str:
+    # lowercase, no accents, single spaces: "Chefs  de Cuisine" and "chefs de cuisine" are the same key
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return SPACES_RE.sub(" ", text.lower()).strip()
+
+### --- Sorted-array prefix index over the role titles --- ###
+class TitleCompleter:
+    """
+    Every title is indexed from each word start ("software developers", "developers"), in one
+    sorted array: the keys sharing a prefix are a contiguous range found with bisect.
+    Ranking: the whole title starts with the prefix, then shorter titles, then the ISCO code;
+    it is precomputed as one integer per key. Flat arrays, memory-mapped from the snapshot.
+    """
+    def __init__(self, keys: StringArray, kinds: np.ndarray, ranks: np.ndarray, rows: np.ndarray):
+        self.keys = keys
+        self.kinds = kinds # 0 = key is the whole title, 1 = starts at an inner word
+        self.ranks = ranks
+        self.rows = rows
+        # only prefixes of the catalog's own keys are stored (a miss is not): bounded by the catalog, not by the input
+        self._memo: dict[str, list[int]] = {}
+
+    @classmethod
+    def build(cls, titles: list[str], codes: list[str]) -> "TitleCompleter":
+        codes = [code.strip() for code in codes]
+        entries = []
+        for row, title in enumerate(normalize_title(title) for title in titles):
+            if not title:
+                continue
+            for match in re.finditer(r"\S+", title):
+                kind = 0 if match.start() == 0 else 1
+                entries.append((title[match.start():], (kind, len(title), codes[row]), kind, row))
+
+        by_rank = sorted(range(len(entries)), key=lambda i: entries[i][1])
+        rank_of = np.empty(len(entries), dtype=np.int32)
+        rank_of[by_rank] = np.arange(len(entries), dtype=np.int32)
+
+        order = sorted(range(len(entries)), key=lambda i: (entries[i][0], entries[i][1], entries[i][3]))
+        return cls(
+            StringArray.from_list([entries[i][0] for i in order]),
+            np.array([entries[i][2] for i in order], dtype=np.int8),
+            rank_of[order] if order else np.zeros(0, dtype=np.int32),
+            np.array([entries[i][3] for i in order], dtype=np.int32)
+        )
+
+    def save(self, folder: str):
+        self.keys.save(folder, "completer.keys")
+        for name in ARRAYS:
+            save_array(folder, f"completer.{name}", getattr(self, name))
+
+    @classmethod
+    def load(cls, folder: str) -> "TitleCompleter":
+        return cls(StringArray.load(folder, "completer.keys"), *(load_array(folder, f"completer.{name}") for name in ARRAYS))
+
+    def _range(self, key: str) -> tuple[int, int]:
+        start = bisect_left(self.keys, key)
+        # "\uffff" sorts after any character, so this is the end of the prefix range
+        return start, bisect_left(self.keys, key + "\uffff", lo=start)
+
+    def complete(self, prefix: str, limit: int = 10) -> list[int]:
+        prefix = normalize_title(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        short = len(prefix) <= SHORT_PREFIX and limit <= MEMO_ROWS
+        if short and prefix in self._memo:
+            return self._memo[prefix][:limit]
+
+        start, end = self._range(prefix)
+        if start == end:
+            return []
+
+        # best rank first; a title reached from several of its words is listed once
+        order = np.argsort(self.ranks[start:end], kind="stable")
+        rows = self.rows[start:end][order].tolist()
+        result = list(dict.fromkeys(rows))
+
+        if short:
+            self._memo[prefix] = result[:MEMO_ROWS]
+        return result[:limit]
+
+    def exact_rows(self, title: str) -> list[int]:
+        # rows whose whole (normalized) title is exactly this one, in ISCO code order
+        key = normalize_title(title)
+        if not key:
+            return []
+        start = bisect_left(self.keys, key)
+        end = start
+        while end < len(self.keys) and self.keys[end] == key:
+            end += 1
+        matches = [i for i in range(start, end) if self.kinds[i] == 0]
+        return [int(self.rows[i]) for i in sorted(matches, key=lambda i: self.ranks[i])]
@@ -0,0 +1,209 @@
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+import numpy as np
+from catalog.shared import StringArray, save_array, load_array
+
+TOKEN_RE = re.compile(r"\w+")
+
+# how much a match in each column counts towards the ranking
+FIELD_WEIGHTS = {"title": 3.0, "definition": 1.5, "task": 1.0}
+MIN_PREFIX_LENGTH = 3 # shorter query words must match a whole term
+MIN_TOKEN_LENGTH = 2 # single letters ("a", list markers like "(c)") are not searched as words
+ARRAYS = ("postings_ptr", "postings_rows", "postings_weights", "idf", "trigram_ptr", "trigram_rows")
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+### --- Inverted index over the catalog --- ###
+class SearchIndex:
+    """
+    Prebuilt index over title, definition and task text:
+    - inverted token index (term -> rows with their weighted term frequency) for multi-word queries,
+    - trigram index over lowercased titles for plain substring queries.
+    Both are flat arrays (sorted terms + CSR postings), so they can be memory-mapped from the
+    catalog snapshot and shared by every worker. Rows are positions in the catalog.
+    """
+    def __init__(self, titles: StringArray, vocabulary: StringArray, postings_ptr: np.ndarray,
+                 postings_rows: np.ndarray, postings_weights: np.ndarray, idf: np.ndarray,
+                 trigrams: StringArray, trigram_ptr: np.ndarray, trigram_rows: np.ndarray):
+        self.titles = titles # lowercased
+        self.size = len(titles)
+        self.vocabulary = vocabulary
+        self.postings_ptr = postings_ptr
+        self.postings_rows = postings_rows
+        self.postings_weights = postings_weights
+        self.idf = idf
+        self.trigrams = trigrams
+        self.trigram_ptr = trigram_ptr
+        self.trigram_rows = trigram_rows
+
+    @classmethod
+    def build(cls, titles: list[str], definitions: list[str], tasks: list[str]) -> "SearchIndex":
+        size = len(titles)
+        postings: dict[str, dict[int, float]] = defaultdict(dict)
+        for field, column in (("title", titles), ("definition", definitions), ("task", tasks)):
+            weight = FIELD_WEIGHTS[field]
+            for row, text in enumerate(column):
+                counts: dict[str, int] = defaultdict(int)
+                for token in tokenize(text):
+                    counts[token] += 1
+                for token, tf in counts.items():
+                    entry = postings[token]
+                    entry[row] = entry.get(row, 0.0) + weight * (1.0 + math.log(tf))
+
+        vocabulary = sorted(postings)
+        rows, weights = [], []
+        ptr = [0]
+        for term in vocabulary:
+            for row, weight in sorted(postings[term].items()):
+                rows.append(row)
+                weights.append(weight)
+            ptr.append(len(rows))
+        idf = [math.log(1.0 + size / len(postings[term])) for term in vocabulary]
+
+        lowered = [t.lower() for t in titles]
+        trigram_rows: dict[str, set[int]] = defaultdict(set)
+        for row, title in enumerate(lowered):
+            for gram in _trigrams(title):
+                trigram_rows[gram].add(row)
+        grams = sorted(trigram_rows)
+        gram_rows = []
+        gram_ptr = [0]
+        for gram in grams:
+            gram_rows.extend(sorted(trigram_rows[gram]))
+            gram_ptr.append(len(gram_rows))
+
+        return cls(
+            StringArray.from_list(lowered),
+            StringArray.from_list(vocabulary),
+            np.array(ptr, dtype=np.int64),
+            np.array(rows, dtype=np.int32),
+            np.array(weights, dtype=np.float64),
+            np.array(idf, dtype=np.float64),
+            StringArray.from_list(grams),
+            np.array(gram_ptr, dtype=np.int64),
+            np.array(gram_rows, dtype=np.int32)
+        )
+
+    def save(self, folder: str):
+        self.titles.save(folder, "search.titles")
+        self.vocabulary.save(folder, "search.vocabulary")
+        self.trigrams.save(folder, "search.trigrams")
+        for name in ARRAYS:
+            save_array(folder, f"search.{name}", getattr(self, name))
+
+    @classmethod
+    def load(cls, folder: str) -> "SearchIndex":
+        arrays = {name: load_array(folder, f"search.{name}") for name in ARRAYS}
+        return cls(
+            StringArray.load(folder, "search.titles"),
+            StringArray.load(folder, "search.vocabulary"),
+            arrays["postings_ptr"], arrays["postings_rows"], arrays["postings_weights"], arrays["idf"],
+            StringArray.load(folder, "search.trigrams"),
+            arrays["trigram_ptr"], arrays["trigram_rows"]
+        )
+
+    def _term_id(self, terms: StringArray, term: str) -> int | None:
+        i = bisect_left(terms, term)
+        return i if i < len(terms) and terms[i] == term else None
+
+    def _expand(self, token: str) -> list[int]:
+        # every vocabulary term starting with the token ("manag" -> manager, managers, managing...)
+        if len(token) < MIN_PREFIX_LENGTH:
+            term_id = self._term_id(self.vocabulary, token)
+            return [] if term_id is None else [term_id]
+
+        start = bisect_left(self.vocabulary, token)
+        terms = []
+        for term_id in range(start, len(self.vocabulary)):
+            if not self.vocabulary[term_id].startswith(token):
+                break
+            terms.append(term_id)
+        return terms
+
+    def _gram_rows(self, gram_id: int | None) -> set[int]:
+        if gram_id is None:
+            return set()
+        return set(self.trigram_rows[self.trigram_ptr[gram_id]:self.trigram_ptr[gram_id + 1]].tolist())
+
+    def title_rows(self, query: str) -> set[int]:
+        """
+        Rows whose lowercased title contains the query, answered from the trigram index.
+        """
+        if len(query) < 3:
+            return self.titles.rows_containing(query)
+
+        gram_ids = [self._term_id(self.trigrams, gram) for gram in _trigrams(query)]
+        sizes = [0 if i is None else int(self.trigram_ptr[i + 1] - self.trigram_ptr[i]) for i in gram_ids]
+        gram_ids = [gram_id for _, gram_id in sorted(zip(sizes, gram_ids), key=lambda pair: pair[0])]
+
+        candidates = self._gram_rows(gram_ids[0])
+        for gram_id in gram_ids[1:]:
+            if not candidates:
+                break
+            candidates &= self._gram_rows(gram_id)
+
+        # trigrams only narrow the candidates down, the real check is still the substring
+        return {row for row in candidates if query in self.titles[row]}
+
+    def title_rows_batch(self, batch: list[list[str]]) -> list[set[int]]:
+        """
+        Matches many users' inputs at once: every distinct pattern in the whole batch is
+        resolved once, so five roles (or a thousand profiles) share the same lookups.
+        """
+        resolved: dict[str, set[int]] = {}
+        for patterns in batch:
+            for pattern in patterns:
+                key = pattern.lower().strip()
+                if key and key not in resolved:
+                    resolved[key] = self.title_rows(key)
+
+        results = []
+        for patterns in batch:
+            rows: set[int] = set()
+            for pattern in patterns:
+                rows |= resolved.get(pattern.lower().strip(), set())
+            results.append(rows)
+        return results
+
+    def search(self, query: str) -> list[int]:
+        """
+        Returns the matching rows, best first. A row matches when the whole query is a
+        substring of its title, or when every query word (as a prefix) appears in any column.
+        """
+        query = query.lower().strip()
+        if not query:
+            return []
+
+        # title matches always come first: the more of the title the query covers, the better
+        # ("Managers" before "Mining Managers"), then the word score decides
+        title_scores = {row: len(query) / len(self.titles[row]) for row in self.title_rows(query)}
+        scores: dict[int, float] = {row: 0.0 for row in title_scores}
+
+        tokens = [token for token in tokenize(query) if len(token) >= MIN_TOKEN_LENGTH]
+        if tokens:
+            matched: dict[int, float] | None = None
+            for token in tokens:
+                token_scores: dict[int, float] = defaultdict(float)
+                for term_id in self._expand(token):
+                    idf = float(self.idf[term_id])
+                    start, end = self.postings_ptr[term_id], self.postings_ptr[term_id + 1]
+                    for row, weight in zip(self.postings_rows[start:end].tolist(), self.postings_weights[start:end].tolist()):
+                        token_scores[row] += idf * weight
+
+                if matched is None:
+                    matched = token_scores
+                else:
+                    matched = {row: score + token_scores[row] for row, score in matched.items() if row in token_scores}
+                if not matched:
+                    break
+
+            for row, score in (matched or {}).items():
+                scores[row] = scores.get(row, 0.0) + score
+
+        return sorted(scores, key=lambda row: (-title_scores.get(row, -1.0), -scores[row], row))
@@ -0,0 +1,107 @@
+import mmap
+import os
+from bisect import bisect_right
+import numpy as np
+
+### --- Read-only arrays shared by every worker --- ###
+# Everything the catalog needs at runtime is written once to the snapshot folder and then
+# memory-mapped: the pages live in the OS page cache, so N workers on the same machine map
+# the same physical memory instead of holding N private copies of Python objects.
+
+class StringArray:
+    """
+    List-like, read-only sequence of strings: one UTF-8 blob plus the byte offsets of each item.
+    Items are decoded on access, so only the strings actually used become Python objects.
+    Supports len(), indexing and bisect (the items of a sorted array stay sorted).
+    """
+    def __init__(self, data, offsets: np.ndarray):
+        self.data = data # bytes or mmap.mmap: slicing both gives bytes
+        self.offsets = offsets
+        self.bounds = memoryview(np.ascontiguousarray(offsets, dtype=np.int64)) # plain ints, fast to index
+
+    @classmethod
+    def from_list(cls, values: list[str]) -> "StringArray":
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return cls(b"".join(encoded), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self.data[self.bounds[i]:self.bounds[i + 1]].decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def rows_containing(self, needle: str) -> set[int]:
+        # substring search straight on the blob, a match may not cross into the next item
+        pattern = needle.encode("utf-8")
+        if not pattern:
+            return set(range(len(self)))
+
+        rows = set()
+        position = self.data.find(pattern)
+        while position != -1:
+            row = bisect_right(self.bounds, position) - 1
+            end = self.bounds[row + 1]
+            if position + len(pattern) <= end:
+                rows.add(row)
+                position = self.data.find(pattern, end)
+            else:
+                position = self.data.find(pattern, position + 1)
+        return rows
+
+    def tolist(self) -> list[str]:
+        return list(self)
+
+    def save(self, folder: str, name: str):
+        with open(os.path.join(folder, f"{name}.bin"), "wb") as f:
+            f.write(self.data[:])
+        save_array(folder, f"{name}.offsets", self.offsets)
+
+    @classmethod
+    def load(cls, folder: str, name: str) -> "StringArray":
+        with open(os.path.join(folder, f"{name}.bin"), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                data = b"" # an empty file cannot be mapped
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, load_array(folder, f"{name}.offsets"))
+
+def save_array(folder: str, name: str, array: np.ndarray):
+    np.save(os.path.join(folder, f"{name}.npy"), np.asarray(array))
+
+def load_array(folder: str, name: str) -> np.ndarray:
+    path = os.path.join(folder, f"{name}.npy")
+    try:
+        # plain ndarray view of the mapping: same pages, without numpy.memmap's slow indexing
+        return np.load(path, mmap_mode="r").view(np.ndarray)
+    except ValueError:
+        # empty array: numpy refuses to memory-map zero bytes
+        return np.load(path)
+
+### --- Memory of this process --- ###
+def process_memory() -> dict:
+    """
+    Resident memory in MB. On Linux RSS is split into anonymous (private to the worker) and
+    file-backed pages (the mapped snapshot, shared with the other workers).
+    """
+    fields = {"VmRSS": "rss_mb", "RssAnon": "private_mb", "RssFile": "file_mapped_mb", "RssShmem": "shared_memory_mb"}
+    memory = {"pid": os.getpid()}
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in fields:
+                    memory[fields[key]] = round(int(value.split()[0]) / 1024, 1) # kB -> MB
+    except OSError:
+        import resource
+        memory["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return memory
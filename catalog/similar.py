@@ -0,0 +1,98 @@
+import math
+from collections import defaultdict
+import numpy as np
+from catalog.search import tokenize, MIN_TOKEN_LENGTH
+from catalog.shared import save_array, load_array
+
+# terms found in more than this share of the roles ("and", "the", "of"...) carry no signal
+MAX_DOCUMENT_FREQUENCY = 0.5
+FILES = ("indptr", "indices", "data", "levels", "row_of")
+
+### --- TF-IDF vectors of the role descriptions --- ###
+class RoleVectors:
+    """
+    L2-normalized TF-IDF vectors of definition + task text, one row per catalog row, kept
+    as a CSR matrix in three flat numpy arrays (indptr, indices, data), so the cosine
+    similarity of one role against all the others is a single sparse matrix-vector product.
+    """
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, levels: np.ndarray,
+                 row_of: np.ndarray | None = None):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.levels = levels # code length of each row: roles are only compared within their level
+        self.size = len(indptr) - 1
+        self.width = int(indices.max()) + 1 if len(indices) else 0
+        # row of every stored value: saved in the snapshot too, so it is mapped like the CSR arrays
+        if row_of is None:
+            row_of = np.repeat(np.arange(self.size, dtype=np.int32), np.diff(indptr))
+        self.row_of = row_of
+
+    def scores(self, row: int) -> np.ndarray:
+        start, end = self.indptr[row], self.indptr[row + 1]
+        query = np.zeros(self.width, dtype=np.float32)
+        query[self.indices[start:end]] = self.data[start:end]
+
+        # X @ q: only the stored values are multiplied, then summed per row
+        return np.bincount(self.row_of, weights=self.data * query[self.indices], minlength=self.size)
+
+    def similar(self, row: int, k: int = 5) -> list[tuple[int, float]]:
+        if self.indptr[row] == self.indptr[row + 1]:
+            return [] # role without any description
+
+        scores = self.scores(row)
+        scores[self.levels != self.levels[row]] = -1.0
+        scores[row] = -1.0
+
+        k = min(k, self.size - 1)
+        if k <= 0:
+            return []
+        # top k without sorting the whole catalog, then only those k are ordered
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(int(i), round(float(scores[i]), 4)) for i in top if scores[i] > 0]
+
+    def save(self, folder: str):
+        for name in FILES:
+            save_array(folder, f"vectors.{name}", getattr(self, name))
+
+    @classmethod
+    def load(cls, folder: str) -> "RoleVectors":
+        return cls(*(load_array(folder, f"vectors.{name}") for name in FILES))
+
+def build_role_vectors(codes: list[str], definitions: list[str], tasks: list[str]) -> RoleVectors:
+    documents = []
+    for definition, task in zip(definitions, tasks):
+        counts: dict[str, int] = defaultdict(int)
+        for token in tokenize(f"{definition} {task}"):
+            if len(token) >= MIN_TOKEN_LENGTH and not token.isdigit():
+                counts[token] += 1
+        documents.append(counts)
+
+    frequency: dict[str, int] = defaultdict(int)
+    for counts in documents:
+        for term in counts:
+            frequency[term] += 1
+
+    size = len(documents)
+    limit = MAX_DOCUMENT_FREQUENCY * size
+    terms = sorted(term for term, df in frequency.items() if df <= limit)
+    columns = {term: j for j, term in enumerate(terms)}
+    idf = {term: math.log(1.0 + size / frequency[term]) for term in terms}
+
+    indptr = [0]
+    indices: list[int] = []
+    data: list[float] = []
+    for counts in documents:
+        row = sorted((columns[term], (1.0 + math.log(tf)) * idf[term]) for term, tf in counts.items() if term in columns)
+        norm = math.sqrt(sum(weight * weight for _, weight in row)) or 1.0
+        indices.extend(j for j, _ in row)
+        data.extend(weight / norm for _, weight in row)
+        indptr.append(len(indices))
+
+    return RoleVectors(
+        np.array(indptr, dtype=np.int64),
+        np.array(indices, dtype=np.int32),
+        np.array(data, dtype=np.float32),
+        np.array([len(code.strip()) for code in codes], dtype=np.int8)
+    )
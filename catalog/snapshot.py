@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from typing import TYPE_CHECKING
+from catalog.shared import StringArray
+from catalog.search import SearchIndex
+from catalog.autocomplete import TitleCompleter
+from catalog.similar import RoleVectors, build_role_vectors
+
+if TYPE_CHECKING:
+    import pandas as pd # imported by read_workbook() only when the EXCEL file has to be parsed
+
+SNAPSHOT_DIR = "data/.snapshot"
+SNAPSHOT_FORMAT = 3 # bump when the layout changes: older folders are simply ignored
+COLUMNS = ["id", "title", "definition", "task"]
+
+### --- Compact snapshot of the ISCO-08 workbook and of its indexes --- ###
+# Layout: data/.snapshot/<hash>-v<format>/ with, for every column, a UTF-8 blob (<col>.bin)
+# and the byte offsets of each cell (<col>.offsets.npy), plus the search, autocomplete and
+# similarity indexes as flat arrays. Everything is memory-mapped read-only when loaded, so
+# the workers of one machine share the same pages instead of parsing private copies.
+
+def workbook_hash(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def snapshot_path(content_hash: str, snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    return os.path.join(snapshot_dir, f"{content_hash[:16]}-v{SNAPSHOT_FORMAT}")
+
+def build_parts(df: "pd.DataFrame") -> dict:
+    # everything the Catalog needs, built in memory from the parsed workbook
+    columns = {column: df[column].astype(str).tolist() for column in COLUMNS}
+    return {
+        "columns": {column: StringArray.from_list(values) for column, values in columns.items()},
+        "search_index": SearchIndex.build(columns["title"], columns["definition"], columns["task"]),
+        "completer": TitleCompleter.build(columns["title"], columns["id"]),
+        "vectors": build_role_vectors(columns["id"], columns["definition"], columns["task"])
+    }
+
+def build_snapshot(df: "pd.DataFrame", content_hash: str, snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    folder = snapshot_path(content_hash, snapshot_dir)
+    tmp_folder = f"{folder}.tmp-{os.getpid()}"
+    os.makedirs(tmp_folder, exist_ok=True)
+
+    parts = build_parts(df)
+    for column, values in parts["columns"].items():
+        values.save(tmp_folder, column)
+    parts["search_index"].save(tmp_folder)
+    parts["completer"].save(tmp_folder)
+    parts["vectors"].save(tmp_folder)
+
+    with open(os.path.join(tmp_folder, "meta.json"), "w") as f:
+        json.dump({"hash": content_hash, "format": SNAPSHOT_FORMAT, "rows": len(df), "columns": COLUMNS}, f, indent=4)
+
+    # publishing the folder in one step, so readers never see a half-written snapshot
+    try:
+        os.rename(tmp_folder, folder)
+    except OSError:
+        # another worker already published the same snapshot
+        shutil.rmtree(tmp_folder, ignore_errors=True)
+
+    return folder
+
+def load_snapshot(content_hash: str, snapshot_dir: str = SNAPSHOT_DIR) -> dict | None:
+    folder = snapshot_path(content_hash, snapshot_dir)
+    meta_path = os.path.join(folder, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+
+        if meta.get("hash") != content_hash or meta.get("format") != SNAPSHOT_FORMAT:
+            return None
+
+        return {
+            "columns": {column: StringArray.load(folder, column) for column in meta["columns"]},
+            "search_index": SearchIndex.load(folder),
+            "completer": TitleCompleter.load(folder),
+            "vectors": RoleVectors.load(folder)
+        }
+
+    except Exception as e:
+        print(f"Error loading catalog snapshot: {e}")
+        return None
+
+### --- Command line: build / bench --- ###
+def _bench(path: str, repeat: int = 5):
+    from catalog.store import read_workbook
+
+    content_hash = workbook_hash(path)
+    if load_snapshot(content_hash) is None:
+        build_snapshot(read_workbook(path), content_hash)
+
+    def best_of(func) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
+
+    excel_ms = best_of(lambda: build_parts(read_workbook(path)))
+    snapshot_ms = best_of(lambda: load_snapshot(workbook_hash(path)))
+
+    print(f"Excel + indexes:        {excel_ms:8.2f} ms")
+    print(f"Snapshot (hash + mmap): {snapshot_ms:8.2f} ms")
+    print(f"Speed-up:               {excel_ms / snapshot_ms:8.1f}x")
+
+def _worker_memory(args) -> dict:
+    path, shared = args
+    from catalog.store import Catalog, read_workbook
+    from catalog.shared import process_memory
+
+    content_hash = workbook_hash(path)
+    parts = load_snapshot(content_hash) if shared else build_parts(read_workbook(path))
+    catalog = Catalog(parts, 0.0, content_hash)
+
+    # touching every index like a busy worker would
+    for row in range(len(catalog.roles)):
+        role = catalog.roles[row]
+        catalog.search(role.title[:4])
+        catalog.complete(role.title[:3])
+        catalog.similar(role.id)
+    return process_memory()
+
+def _memory(path: str, workers: int = 4):
+    import multiprocessing
+
+    content_hash = workbook_hash(path)
+    if load_snapshot(content_hash) is None:
+        build_snapshot(read_workbook(path), content_hash)
+
+    # spawn: fresh interpreters, like separate uvicorn workers (no copy-on-write sharing)
+    context = multiprocessing.get_context("spawn")
+    for label, shared in (("private copy", False), ("mmap snapshot", True)):
+        with context.Pool(workers) as pool:
+            reports = pool.map(_worker_memory, [(path, shared)] * workers)
+        for report in reports:
+            print(f"{label:14} pid {report['pid']:>7}: " + ", ".join(f"{k} {v}" for k, v in report.items() if k != "pid"))
+
+if __name__ == "__main__":
+    from catalog.store import ISCO_FILE, read_workbook
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    workbook = sys.argv[2] if len(sys.argv) > 2 else ISCO_FILE
+
+    if command == "build":
+        content_hash = workbook_hash(workbook)
+        folder = build_snapshot(read_workbook(workbook), content_hash)
+        print(f"Snapshot written to {folder}")
+    elif command == "bench":
+        _bench(workbook)
+    elif command == "memory":
+        _memory(workbook)
+    else:
+        print("Usage: python -m catalog.snapshot [build|bench|memory] [workbook]")
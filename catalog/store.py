@@ -0,0 +1,175 @@
+import os
+import threading
+from typing import TYPE_CHECKING
+from models import Role
+from catalog.tree import CodeTree
+from catalog.snapshot import workbook_hash, load_snapshot, build_snapshot, build_parts
+from metrics import timed
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ISCO_FILE = "data/ISCO-08 EN Structure and definitions.xlsx"
+
+### --- Roles built on demand from the shared columns --- ###
+class RoleList:
+    """
+    Row i of the catalog as a Pydantic Role, created the first time it is needed: a worker
+    only holds the objects of the roles it actually served.
+    """
+    def __init__(self, columns: dict):
+        self.columns = columns
+        self._roles: list[Role | None] = [None] * len(columns["id"])
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+    def __getitem__(self, row: int) -> Role:
+        role = self._roles[row]
+        if role is None:
+            role = Role(**{column: values[row] for column, values in self.columns.items()})
+            self._roles[row] = role
+        return role
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+### --- ISCO-08 catalog --- ###
+class Catalog:
+    """
+    ISCO-08 workbook, columns B (id), C (title), D (definition), E (task), with its search,
+    autocomplete and similarity indexes. Normally memory-mapped from the snapshot (see
+    catalog/snapshot.py), so every worker shares the same read-only pages.
+    """
+    def __init__(self, parts: dict, mtime: float, version: str):
+        self.mtime = mtime
+        self.version = version # content hash of the workbook
+
+        self.columns = parts["columns"]
+        self.roles = RoleList(self.columns)
+        self.search_index = parts["search_index"]
+        self.completer = parts["completer"]
+        self.vectors = parts["vectors"]
+        self.tree = CodeTree([code.strip() for code in self.columns["id"]])
+
+    def search(self, query: str) -> list[Role]:
+        return [self.roles[row] for row in self.search_index.search(query)]
+
+    def search_page(self, query: str, offset: int, limit: int) -> tuple[list[Role], int]:
+        # only the requested slice of the ranking is turned into Role objects
+        rows = self.search_index.search(query)
+        return [self.roles[row] for row in rows[offset:offset + limit]], len(rows)
+
+    def complete(self, prefix: str, limit: int = 10) -> list[Role]:
+        return [self.roles[row] for row in self.completer.complete(prefix, limit)]
+
+    def get_role(self, code: str) -> Role | None:
+        row = self.tree.row(str(code).strip())
+        return None if row is None else self.roles[row]
+
+    def _roles_for(self, codes: list[str]) -> list[Role]:
+        return [self.roles[self.tree.rows[code]] for code in codes]
+
+    def children(self, code: str) -> list[Role]:
+        return self._roles_for(self.tree.children.get(str(code).strip(), []))
+
+    def ancestors(self, code: str) -> list[Role]:
+        return self._roles_for(self.tree.ancestors(str(code).strip()))
+
+    def siblings(self, code: str) -> list[Role]:
+        return self._roles_for(self.tree.siblings(str(code).strip()))
+
+    def similar(self, code: str, k: int = 5) -> list[tuple[Role, float]]:
+        row = self.tree.row(str(code).strip())
+        if row is None:
+            return []
+        return [(self.roles[other], score) for other, score in self.vectors.similar(row, k)]
+
+    def ids_for_titles(self, titles: list[str]) -> list[str]:
+        # a few titles appear at more than one level: every matching ISCO code is returned
+        ids = []
+        for title in titles:
+            for row in self.completer.exact_rows(title):
+                code = self.roles[row].id.strip()
+                if code not in ids:
+                    ids.append(code)
+        return ids
+
+    def match_titles_batch(self, batch: list[list[str]]) -> list[list[str]]:
+        # one sorted list of distinct titles for every list of inputs
+        return [
+            sorted({self.roles[row].title for row in rows})
+            for rows in self.search_index.title_rows_batch(batch)
+        ]
+
+def read_workbook(path: str = ISCO_FILE) -> "pd.DataFrame":
+    # pandas/openpyxl cost ~0.3 s of import: paid only when there is no snapshot of this workbook
+    import pandas as pd
+
+    df = pd.read_excel(path, usecols="B,C,D,E", dtype=str)
+
+    df.columns = ["id", "title", "definition", "task"]
+    df = df.fillna("") # managing empty strings
+
+    return df
+
+_catalog: Catalog | None = None
+_lock = threading.RLock()
+
+def load_catalog(path: str = ISCO_FILE) -> Catalog:
+    global _catalog
+
+    with _lock:
+        mtime = os.path.getmtime(path)
+        version = workbook_hash(path)
+
+        # fast path: memory-mapped snapshot of this exact workbook, Excel only when the hash changed
+        with timed("catalog.load_snapshot"):
+            parts = load_snapshot(version)
+        if parts is None:
+            with timed("catalog.read_workbook"):
+                df = read_workbook(path)
+            try:
+                build_snapshot(df, version)
+                parts = load_snapshot(version)
+            except OSError as e:
+                print(f"Error writing catalog snapshot: {e}")
+
+            if parts is None:
+                # read-only disk: this worker keeps a private in-memory copy
+                parts = build_parts(df)
+
+        _catalog = Catalog(parts, mtime, version)
+
+        return _catalog
+
+def current_catalog(path: str = ISCO_FILE) -> Catalog | None:
+    """
+    The loaded catalog if the workbook did not change since, None when a reload is due.
+    Never loads anything: safe on the event loop.
+    """
+    current = _catalog
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        # Workbook temporarily missing (e.g. being replaced): keep serving the last good copy
+        return current
+
+    return current if current is not None and current.mtime == mtime else None
+
+def get_catalog(path: str = ISCO_FILE) -> Catalog:
+    """
+    Returns the shared catalog, reloading it only when the workbook's mtime changed.
+    """
+    current = current_catalog(path)
+    if current is not None:
+        return current
+
+    with _lock:
+        # another thread may have reloaded while we were waiting
+        current = current_catalog(path)
+        if current is not None:
+            return current
+
+        return load_catalog(path)
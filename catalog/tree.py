@@ -0,0 +1,61 @@
+### --- ISCO-08 code hierarchy --- ###
+# Codes nest by prefix: major group (1 digit) -> sub-major (2) -> minor (3) -> unit group (4),
+# e.g. 1 -> 11 -> 111 -> 1111.
+
+LEVEL_NAMES = {1: "Major group", 2: "Sub-major group", 3: "Minor group", 4: "Unit group"}
+
+class CodeTree:
+    """
+    Hash index from ISCO code to catalog row, plus precomputed parent/children links,
+    so browsing the hierarchy never scans the catalog.
+    """
+    def __init__(self, codes: list[str]):
+        self.rows = {code: row for row, code in enumerate(codes)}
+        self.parents: dict[str, str | None] = {}
+        self.children: dict[str, list[str]] = {code: [] for code in self.rows}
+        self.roots: list[str] = []
+
+        for code in self.rows:
+            parent = self._find_parent(code)
+            self.parents[code] = parent
+            if parent is None:
+                self.roots.append(code)
+            else:
+                self.children[parent].append(code)
+
+        self.roots.sort()
+        for kids in self.children.values():
+            kids.sort()
+
+    def _find_parent(self, code: str) -> str | None:
+        # nearest shorter code that is a prefix (normally just one digit less)
+        for size in range(len(code) - 1, 0, -1):
+            if code[:size] in self.rows:
+                return code[:size]
+        return None
+
+    def row(self, code: str) -> int | None:
+        return self.rows.get(code)
+
+    def parent(self, code: str) -> str | None:
+        return self.parents.get(code)
+
+    def ancestors(self, code: str) -> list[str]:
+        # from the major group down to the direct parent
+        chain = []
+        parent = self.parents.get(code)
+        while parent is not None:
+            chain.append(parent)
+            parent = self.parents.get(parent)
+        chain.reverse()
+        return chain
+
+    def siblings(self, code: str) -> list[str]:
+        if code not in self.rows:
+            return []
+        parent = self.parents[code]
+        group = self.roots if parent is None else self.children[parent]
+        return [other for other in group if other != code]
+
+    def level_name(self, code: str) -> str:
+        return LEVEL_NAMES.get(len(code), "Group")
@@ -1,8 +1,62 @@
+import os
 from fastapi.templating import Jinja2Templates
 from passlib.context import CryptContext
+from metrics import TimedTemplate
 
-# Setting dir for templates
+# Setting dir for templates (renders are timed, see metrics.py)
 templates = Jinja2Templates(directory="templates")
+templates.env.template_class = TimedTemplate
+
+# Argon2 cost parameters (tunable from the environment).
+# Stored hashes with different parameters are transparently rehashed at the next login.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536")) # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
 
 # password managing
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
\ No newline at end of file
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM
+)
+
+# Hashing runs off the event loop on a bounded pool; past the queue limit requests get a fast 503
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "32"))
+
+# Cache of the logged-in User/Organization objects (see cache.py)
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60")) # seconds
+
+
+# Where accounts are stored: "json" (one file per account under data/) or "sqlite"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "data/app.db")
+
+# Thread pool running the blocking crud work (file/SQLite I/O) for the async routes, see crud_async.py.
+# 0 runs it inline on the event loop (old behaviour, only useful for benchmarks).
+CRUD_WORKERS = int(os.getenv("CRUD_WORKERS", "8"))
+
+# Skill-gap reports cached per user (see skills/gap.py), dropped when the profile changes
+GAP_CACHE_SIZE = int(os.getenv("GAP_CACHE_SIZE", "1024"))
+GAP_CACHE_TTL = float(os.getenv("GAP_CACHE_TTL", "600")) # seconds
+
+# Rendered search-result fragments (see fragments.py), bounded by their total size
+FRAGMENT_CACHE_BYTES = int(os.getenv("FRAGMENT_CACHE_BYTES", str(8 * 1024 * 1024)))
+
+# Search results per page (HTML pages and /api/search), whatever the number of matches
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "20"))
+SEARCH_MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", "100"))
+
+# HTTP caching and compression (see http_cache.py)
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "31536000")) # seconds, for versioned /static URLs
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024")) # bytes, smaller bodies are sent as they are
+
+# Requests slower than this are printed with their per-phase breakdown (0 = off), see metrics.py
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))
+
+# Startup budget: imports + warm-up (catalog, templates, Argon2) before the first request can be served.
+# Only reported, a slower start prints a warning.
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "2000"))
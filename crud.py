@@ -1,70 +1,70 @@
-import json
-import os
-import pandas as pd
-from models import User, Organization, Role
+from models import User, Organization, Role, SkillRequirement, SkillGapReport, OrgAnalytics
+from catalog.store import get_catalog, current_catalog
+from cache import user_cache, org_cache, gap_cache, principal_key
+from storage.backend import get_backend
+from storage.base import USERS, ORGANIZATIONS
+from skills.store import get_skill_store, current_skill_store
+from skills.gap import get_skill_matrix, analyse_gaps
+from skills import org_analytics
 
-DATA_DIR_USERS = "data/users"
-os.makedirs(DATA_DIR_USERS, exist_ok=True)
-
-DATA_DIR_ORGS = "data/organizations"
-os.makedirs(DATA_DIR_ORGS, exist_ok=True)
+# Accounts live in the configured storage backend (JSON files or SQLite, see storage/)
 
 ### --- User CRUD operations --- ###
-def get_json_path(username: str) -> str:
-    safe_name = username.lower().strip()
-    return os.path.join(DATA_DIR_USERS, f"{safe_name}.json")
-
 def get_user(username: str) -> User | None:
-    path = get_json_path(username)
-    if not os.path.exists(path):
+    data = get_backend().get(USERS, username)
+    if data is None:
         return None
     
-    with open(path, "r") as f:
-        data = json.load(f)
-        return User(**data)
+    return User(**data)
     
 def create_user(user: User):
-    path = get_json_path(user.username)
-    if os.path.exists(path):
-        raise ValueError("User already exists")
-    
-    with open(path, "w") as f:
-        json.dump(user.model_dump(), f, indent=4) # model_dump() transforms the Pydantic model to a dict for JSON file
+    # model_dump() transforms the Pydantic model to a dict for the storage
+    get_backend().create(USERS, user.username, user.model_dump()) # ValueError if the user already exists
 
 def set_target_roles_user(user: User, target_roles: list[str]):
-    path = get_json_path(user.username)
-    if not os.path.exists(path):
+    if not get_backend().exists(USERS, user.username):
         return None
     
     matched_roles = extracting_target_roles(target_roles)
     user.target_roles = matched_roles
 
-    with open(path, "r") as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            data = {} # Managing empty file
-
-    data["target_roles"] = matched_roles
+    get_backend().update(USERS, user.username, {"target_roles": matched_roles})
+    user_cache.invalidate(principal_key(user.username))
+    gap_cache.invalidate(principal_key(user.username))
+    member_profile_changed(user)
+
+def set_target_roles_users(updates: list[tuple[User, list[str]]]):
+    """
+    Bulk profile update: the inputs of every user are matched in a single batch.
+    """
+    backend = get_backend()
+    updates = [(user, roles) for user, roles in updates if backend.exists(USERS, user.username)]
+    matched_batch = extracting_target_roles_batch([roles for _, roles in updates])
+
+    for (user, _), matched_roles in zip(updates, matched_batch):
+        user.target_roles = matched_roles
+        backend.update(USERS, user.username, {"target_roles": matched_roles})
+        user_cache.invalidate(principal_key(user.username))
+        gap_cache.invalidate(principal_key(user.username))
+        member_profile_changed(user)
+
+def set_skills_user(user: User, skills: dict[str, int]) -> bool:
+    # declared proficiency levels, used by the skill-gap assessment
+    if not get_backend().update(USERS, user.username, {"skills": skills}):
+        return False
 
-    with open(path, "w") as f:
-        json.dump(data, f, indent=4)
+    user.skills = skills
+    user_cache.invalidate(principal_key(user.username))
+    gap_cache.invalidate(principal_key(user.username))
+    member_profile_changed(user)
+    return True
 
 def change_password_user(user: User, new_pw: str) -> bool:
-    path = get_json_path(user.username)
-    
-    if not os.path.exists(path):
-        return False
-    
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
-
-        data["hashed_password"] = new_pw
-
-        with open(path, "w") as f:
-            json.dump(data, f, indent=4)
+        if not get_backend().update(USERS, user.username, {"hashed_password": new_pw}):
+            return False
         
+        user_cache.invalidate(principal_key(user.username))
         return True
 
     except Exception as e:
@@ -72,133 +72,256 @@ def change_password_user(user: User, new_pw: str) -> bool:
     
 
 ### --- Organization CRUD operations --- ###
-def get_json_path_org(orgname: str) -> str:
-    safe_name = orgname.lower().strip()
-    return os.path.join(DATA_DIR_ORGS, f"{safe_name}.json")
-
 def get_organization(orgname: str) -> Organization | None:
-    path = get_json_path_org(orgname)
-    if not os.path.exists(path):
+    data = get_backend().get(ORGANIZATIONS, orgname)
+    if data is None:
         return None
     
-    with open(path, "r") as f:
-        data = json.load(f)
-        return Organization(**data)
+    return Organization(**data)
 
 def create_organization(org: Organization):
-    path = get_json_path_org(org.orgname)
-    if os.path.exists(path):
-        raise ValueError("Organization already exists")
-    
-    with open(path, "w") as f:
-        json.dump(org.model_dump(), f, indent=4) # model_dump() transforms the Pydantic model to a dict for JSON file
+    get_backend().create(ORGANIZATIONS, org.orgname, org.model_dump()) # ValueError if the organization already exists
 
 def change_password_org(org: Organization, new_pw: str) -> bool:
-    path = get_json_path_org(org.orgname)
-    
-    if not os.path.exists(path):
-        return False
-    
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
-
-        data["hashed_password"] = new_pw
-
-        with open(path, "w") as f:
-            json.dump(data, f, indent=4)
+        if not get_backend().update(ORGANIZATIONS, org.orgname, {"hashed_password": new_pw}):
+            return False
         
+        org_cache.invalidate(principal_key(org.orgname))
         return True
 
     except Exception as e:
         return False
 
+### --- Organization members --- ###
+# An organization only invites: the user becomes a member (and shares target roles and skills
+# with the organization) after accepting the invitation from their profile.
+def _has_name(names: list[str] | None, name: str) -> bool:
+    return name.lower() in (other.lower() for other in names or [])
+
+def _without_name(names: list[str] | None, name: str) -> list[str]:
+    return [other for other in names or [] if other.lower() != name.lower()]
+
+# Membership lists are changed with backend.update_lists (atomic add/remove, never a whole list
+# built from a cached copy) and checked against the stored records, not the per-worker caches.
+def invite_member_org(org: Organization, username: str) -> bool:
+    user = get_user(username)
+    if user is None:
+        return False
+
+    backend = get_backend()
+    record = backend.get(ORGANIZATIONS, org.orgname)
+    if record is None:
+        return False
+    if _has_name(record.get("members"), user.username):
+        return True
+
+    record = backend.update_lists(ORGANIZATIONS, org.orgname, add={"invited": [user.username]})
+    if record is None:
+        return False
+    org.members, org.invited = record.get("members") or [], record["invited"]
+    org_cache.invalidate(principal_key(org.orgname))
+
+    backend.update_lists(USERS, user.username, add={"invitations": [record["orgname"]]})
+    user_cache.invalidate(principal_key(user.username))
+    return True
+
+def remove_member_org(org: Organization, username: str) -> bool:
+    # removes a member or cancels a pending invitation
+    backend = get_backend()
+    record = backend.get(ORGANIZATIONS, org.orgname)
+    if record is None or not (_has_name(record.get("members"), username) or _has_name(record.get("invited"), username)):
+        return False
+
+    record = backend.update_lists(ORGANIZATIONS, org.orgname, remove={"members": [username], "invited": [username]})
+    if record is None:
+        return False
+    org.members, org.invited = record["members"], record["invited"]
+    org_cache.invalidate(principal_key(org.orgname))
+
+    if backend.update_lists(USERS, username, remove={"organizations": [org.orgname], "invitations": [org.orgname]}) is not None:
+        user_cache.invalidate(principal_key(username))
+    member_event(org.orgname, username)
+    return True
+
+def accept_invitation_user(user: User, orgname: str) -> bool:
+    backend = get_backend()
+    record = backend.get(USERS, user.username)
+    if record is None or not _has_name(record.get("invitations"), orgname):
+        return False
+
+    org = backend.get(ORGANIZATIONS, orgname)
+    if org is None or not _has_name(org.get("invited"), user.username):
+        decline_invitation_user(user, orgname) # withdrawn by the organization meanwhile
+        return False
+
+    if backend.update_lists(ORGANIZATIONS, orgname, add={"members": [user.username]}, remove={"invited": [user.username]}) is None:
+        return False
+    org_cache.invalidate(principal_key(orgname))
+
+    record = backend.update_lists(USERS, user.username, add={"organizations": [org["orgname"]]}, remove={"invitations": [orgname]})
+    if record is not None:
+        user.invitations, user.organizations = record["invitations"], record["organizations"]
+    user_cache.invalidate(principal_key(user.username))
+    member_event(orgname, user.username)
+    return True
+
+def decline_invitation_user(user: User, orgname: str) -> bool:
+    record = get_backend().update_lists(USERS, user.username, remove={"invitations": [orgname]})
+    if record is None:
+        return False
+    user.invitations = record["invitations"]
+    user_cache.invalidate(principal_key(user.username))
+
+    if get_backend().update_lists(ORGANIZATIONS, orgname, remove={"invited": [user.username]}) is not None:
+        org_cache.invalidate(principal_key(orgname))
+    return True
+
+def leave_organization_user(user: User, orgname: str) -> bool:
+    org = get_organization(orgname)
+    if org is None or not remove_member_org(org, user.username):
+        return False
+
+    user.organizations = _without_name(user.organizations, orgname)
+    return True
+
+### --- Organization skill-gap analytics --- ###
+# Every membership or member profile change is appended to the organization's change log in the
+# storage backend; each worker's snapshot (skills/org_analytics.py) replays it and re-reads only those users.
+def member_event(orgname: str, username: str):
+    get_backend().append_event(ORGANIZATIONS, orgname, {"user": username})
+
+def member_profile_changed(user: User):
+    for orgname in user.organizations or []:
+        member_event(orgname, user.username)
+
+def get_org_analytics(org: Organization, top_n: int = 10) -> OrgAnalytics:
+    backend = get_backend()
+    # members read from the backend, not from the (per-worker) org cache
+    org = get_organization(org.orgname) or org
+    members = {member.lower() for member in org.members or []}
+
+    # only users who accepted the invitation (the org is in their own profile) are counted
+    def load_members(usernames: list[str] | None = None) -> list[User]:
+        names = org.members or [] if usernames is None else [name for name in usernames if name.lower() in members]
+        # one bulk read; records were validated when written, so no per-user EmailStr check here
+        users = [User.model_construct(**data) for data in backend.get_many(USERS, names)]
+        return [user for user in users if org.orgname.lower() in (name.lower() for name in user.organizations or [])]
+
+    def read_changes(cursor: int) -> tuple[list[str], int] | None:
+        result = backend.read_events(ORGANIZATIONS, org.orgname, cursor)
+        if result is None:
+            return None
+        events, cursor = result
+        return [event["user"] for event in events if "user" in event], cursor
+
+    return org_analytics.get_analytics(
+        org.orgname, get_skill_matrix(get_skill_store()), get_catalog(), load_members,
+        lambda: backend.event_cursor(ORGANIZATIONS, org.orgname), read_changes, top_n, top_n
+    )
+
 ### --- Extract skill models by user input --- ###
-def extracting_skill_models(user_query: str) -> list[Role] | None:
-    # reading Excel file, only columns B (id), C (title), D (definition), E (task)
-    try: 
-        df = pd.read_excel("data/ISCO-08 EN Structure and definitions.xlsx", usecols="B,C,D,E", dtype=str)
-        
-        df.columns = ["id", "title", "definition", "task"]
-        df = df.fillna("") # managing empty strings
+def catalog_is_current() -> bool:
+    # stat calls only: False when the workbook or skill_models.json changed and must be reloaded
+    return current_catalog() is not None and current_skill_store() is not None
 
+def reload_catalog():
+    get_catalog()
+    get_skill_store()
 
-        # filtering rows, converting to string, case insensitive search
-        filter = df["title"].astype(str).str.contains(user_query, case=False, na=False)
-        results = df[filter]
+def catalog_version() -> str:
+    # content hash of the workbook currently served
+    return get_catalog().version
+
+def extracting_skill_models(user_query: str) -> list[Role] | None:
+    # relevance-ranked lookup on the prebuilt index (title, definition, task), no regex and no full scan
+    try:
+        roles_list = get_catalog().search(user_query)
 
-        if results.empty:
+        if not roles_list:
             return None
         
-        roles_list = []
-
-        for _, row in results.iterrows():
-            new_role = Role(
-                id=row["id"],
-                title=row["title"],
-                definition=row["definition"],
-                task=row["task"]
-            )
-            roles_list.append(new_role)
         return roles_list
     
     except Exception as e:
         print(f"Error extracting skill models: {e}")
         return None
 
+def extracting_skill_models_page(user_query: str, offset: int, limit: int) -> tuple[list[Role], int]:
+    # one page of the ranked results and the total number of matches
+    try:
+        return get_catalog().search_page(user_query, max(offset, 0), max(limit, 0))
+
+    except Exception as e:
+        print(f"Error extracting skill models: {e}")
+        return [], 0
+
 ### --- Extract target roles for user profile --- ###
 def extracting_target_roles(user_inputs: list[str]) -> list[str]:
-    excel_path = "data/ISCO-08 EN Structure and definitions.xlsx"
-    
     if not user_inputs:
         return []
 
-    try:
-        df = pd.read_excel(excel_path, usecols="C")
-        col_title = df.columns[0]
-        
-        all_found_roles = []
-
-        for role_input in user_inputs:
-            # na=False avoiding errors caused by empty cells in Excel
-            filter_mask = df[col_title].astype(str).str.contains(role_input, case=False, na=False)
-            
-            matches = df.loc[filter_mask, col_title].tolist()
-            all_found_roles.extend(matches)
+    return extracting_target_roles_batch([user_inputs])[0]
 
-        unique_roles = sorted(list(set(all_found_roles)))
-        
-        return unique_roles
+def extracting_target_roles_batch(users_inputs: list[list[str]]) -> list[list[str]]:
+    # all the inputs (of one user or of many users) matched together against the title index
+    try:
+        return get_catalog().match_titles_batch(users_inputs)
 
     except Exception as e:
         print(f"Error extracting skills: {e}")
-        return []
+        return [[] for _ in users_inputs]
     
 def get_role_by_id(target_id: str) -> Role | None:
+    # hash lookup on the ISCO code, constant time whatever the catalog size
     try:
-        
-        df = pd.read_excel(
-            "data/ISCO-08 EN Structure and definitions.xlsx", 
-            usecols="B,C,D,E", 
-            dtype=str
-        )
-        df.columns = ["id", "title", "definition", "task"]
-        df = df.fillna("")
+        return get_catalog().get_role(target_id)
 
-        match = df[df["id"].astype(str) == str(target_id)]
+    except Exception as e:
+        print(f"Error getting role by ID: {e}")
+        return None
 
-        if match.empty:
-            return None
+def autocomplete_roles(prefix: str, limit: int = 10) -> list[Role]:
+    return get_catalog().complete(prefix, limit)
 
-        row = match.iloc[0]
+### --- Browse the ISCO code hierarchy --- ###
+def get_role_children(target_id: str) -> list[Role]:
+    return get_catalog().children(target_id)
 
-        return Role(
-            id=row["id"],
-            title=row["title"],
-            definition=row["definition"],
-            task=row["task"]
-        )
+def get_role_ancestors(target_id: str) -> list[Role]:
+    return get_catalog().ancestors(target_id)
 
-    except Exception as e:
-        print(f"Error getting role by ID: {e}")
-        return None
\ No newline at end of file
+def get_role_siblings(target_id: str) -> list[Role]:
+    return get_catalog().siblings(target_id)
+
+def get_similar_roles(target_id: str, k: int = 5) -> list[tuple[Role, float]]:
+    # TF-IDF cosine similarity of definition and tasks, within the same ISCO level
+    return get_catalog().similar(target_id, k)
+
+### --- Skill models (skill_models.json) --- ###
+def get_role_skills(target_id: str) -> list[SkillRequirement]:
+    return get_skill_store().role_skills(target_id)
+
+def get_roles_for_skill(skill: str) -> list[Role]:
+    catalog = get_catalog()
+    roles = [catalog.get_role(role_id) for role_id in get_skill_store().roles_for_skill(skill)]
+    return [role for role in roles if role]
+
+### --- Skill-gap assessment --- ###
+def get_skill_gap(user: User) -> SkillGapReport:
+    store = get_skill_store()
+    catalog = get_catalog()
+    key = principal_key(user.username)
+
+    # a cached report is valid only for the same profile, skill models and catalog
+    fingerprint = (store.mtime, catalog.version, tuple(user.target_roles or []), tuple(sorted((user.skills or {}).items())))
+    cached = gap_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    role_ids = catalog.ids_for_titles(user.target_roles or [])
+    titles = {role_id: catalog.get_role(role_id).title for role_id in role_ids}
+    report = analyse_gaps(get_skill_matrix(store), role_ids, titles, user.skills)
+
+    gap_cache.set(key, (fingerprint, report))
+    return report
@@ -0,0 +1,104 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import crud
+from config import CRUD_WORKERS
+from metrics import timed
+from models import User, Organization, Role, SkillGapReport, OrgAnalytics
+
+# Async versions of the crud API for the `async def` routes: the blocking part
+# (JSON files, SQLite, catalog reloads) runs on a dedicated thread pool, so one slow
+# disk access never stalls the event loop for the other clients.
+
+_executor: ThreadPoolExecutor | None = None
+_workers = CRUD_WORKERS
+
+def set_workers(workers: int):
+    """
+    Resizes the pool (0 = run inline on the event loop).
+    """
+    global _executor, _workers
+
+    old = _executor
+    _executor = None
+    _workers = workers
+    if old is not None:
+        old.shutdown(wait=False)
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_workers, thread_name_prefix="crud")
+    return _executor
+
+async def run_blocking(func, *args):
+    # timed from the caller's side: waiting for a free thread counts too
+    with timed(f"crud.{func.__name__}"):
+        if _workers <= 0:
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+
+### --- User --- ###
+async def get_user(username: str) -> User | None:
+    return await run_blocking(crud.get_user, username)
+
+async def create_user(user: User):
+    return await run_blocking(crud.create_user, user)
+
+async def set_target_roles_user(user: User, target_roles: list[str]):
+    return await run_blocking(crud.set_target_roles_user, user, target_roles)
+
+async def change_password_user(user: User, new_pw: str) -> bool:
+    return await run_blocking(crud.change_password_user, user, new_pw)
+
+async def set_skills_user(user: User, skills: dict[str, int]) -> bool:
+    return await run_blocking(crud.set_skills_user, user, skills)
+
+async def get_skill_gap(user: User) -> SkillGapReport:
+    return await run_blocking(crud.get_skill_gap, user)
+
+### --- Organization --- ###
+async def get_organization(orgname: str) -> Organization | None:
+    return await run_blocking(crud.get_organization, orgname)
+
+async def create_organization(org: Organization):
+    return await run_blocking(crud.create_organization, org)
+
+async def change_password_org(org: Organization, new_pw: str) -> bool:
+    return await run_blocking(crud.change_password_org, org, new_pw)
+
+async def invite_member_org(org: Organization, username: str) -> bool:
+    return await run_blocking(crud.invite_member_org, org, username)
+
+async def remove_member_org(org: Organization, username: str) -> bool:
+    return await run_blocking(crud.remove_member_org, org, username)
+
+async def accept_invitation_user(user: User, orgname: str) -> bool:
+    return await run_blocking(crud.accept_invitation_user, user, orgname)
+
+async def decline_invitation_user(user: User, orgname: str) -> bool:
+    return await run_blocking(crud.decline_invitation_user, user, orgname)
+
+async def leave_organization_user(user: User, orgname: str) -> bool:
+    return await run_blocking(crud.leave_organization_user, user, orgname)
+
+async def get_org_analytics(org: Organization, top_n: int = 10) -> OrgAnalytics:
+    return await run_blocking(crud.get_org_analytics, org, top_n)
+
+### --- Catalog --- ###
+# in-memory lookups, but the first call after the workbook changed reloads it from disk
+async def catalog_ready():
+    # reload (if due) on the pool: the sync crud calls that follow on the event loop stay in-memory
+    if not crud.catalog_is_current():
+        await run_blocking(crud.reload_catalog)
+
+async def extracting_skill_models(user_query: str) -> list[Role] | None:
+    return await run_blocking(crud.extracting_skill_models, user_query)
+
+async def extracting_skill_models_page(user_query: str, offset: int, limit: int) -> tuple[list[Role], int]:
+    return await run_blocking(crud.extracting_skill_models_page, user_query, offset, limit)
+
+async def get_role_by_id(target_id: str) -> Role | None:
+    return await run_blocking(crud.get_role_by_id, target_id)
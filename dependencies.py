@@ -1,5 +1,6 @@
 from fastapi import Request
-import crud
+import crud_async
+from cache import user_cache, org_cache, principal_key
 
 # get current user
 async def get_current_user(request: Request):
@@ -8,7 +9,14 @@ async def get_current_user(request: Request):
     if not token:
         return None
     
-    user = crud.get_user(token)
+    # validated User kept in memory: no json.load + Pydantic validation on every request
+    key = principal_key(token)
+    user = user_cache.get(key)
+    if user is None:
+        user = await crud_async.get_user(token)
+        if user:
+            user_cache.set(key, user)
+
     return user
 
 # get current org
@@ -18,5 +26,11 @@ async def get_current_org(request: Request):
     if not token:
         return None
     
-    org = crud.get_organization(token)
+    key = principal_key(token)
+    org = org_cache.get(key)
+    if org is None:
+        org = await crud_async.get_organization(token)
+        if org:
+            org_cache.set(key, org)
+
     return org
\ No newline at end of file
@@ -0,0 +1,40 @@
+from config import templates, SEARCH_PAGE_SIZE
+from cache import fragment_cache
+import crud
+import crud_async
+
+### --- Cached search-result fragments --- ###
+# The result list of a query only depends on the query, the page and the catalog, never on
+# who is asking: it is rendered once and then served from fragment_cache.
+
+def normalize_query(search: str) -> str:
+    return " ".join(search.split()).title()
+
+async def render_search_results(search: str, page: int, link_details: bool) -> str:
+    """
+    HTML of one page of results for the search forms. link_details: titles link to
+    /details/{id} (logged-in users only).
+    """
+    query = normalize_query(search)
+    page = max(page, 1)
+    await crud_async.catalog_ready()
+    key = ("user" if link_details else "guest", query.lower(), page, crud.catalog_version())
+
+    fragment = fragment_cache.get(key)
+    if fragment is not None:
+        return fragment
+
+    # one page of the ranking: response size stays bounded whatever the query
+    roles_list, total = await crud_async.extracting_skill_models_page(query, (page - 1) * SEARCH_PAGE_SIZE, SEARCH_PAGE_SIZE)
+    fragment = templates.get_template("search_results.html").render(
+        query=query,
+        roles_list=roles_list,
+        link_details=link_details,
+        search_action="/extract_skill_models" if link_details else "/extract_general_skill_models",
+        last_search=query,
+        page=page,
+        pages=-(-total // SEARCH_PAGE_SIZE),
+        total=total
+    )
+    fragment_cache.set(key, fragment)
+    return fragment
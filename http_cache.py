@@ -0,0 +1,232 @@
+import hashlib
+import os
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from fastapi.staticfiles import StaticFiles
+from config import STATIC_MAX_AGE, COMPRESSION_MIN_SIZE
+from catalog.store import current_catalog
+from skills.store import current_skill_store
+import crud_async
+
+try:
+    import brotli # optional: without it responses are gzip-compressed only
+except ImportError:
+    brotli = None
+
+### --- ETags for catalog-derived responses --- ###
+# Public JSON views of the catalog, and the details page (per session, so it stays private)
+PUBLIC_PATHS = ("/api/roles/", "/api/search", "/api/skills/")
+PRIVATE_PATHS = ("/details/",)
+
+def catalog_version() -> str | None:
+    # everything these responses are built from: the workbook and skill_models.json.
+    # None while a reload is due (nothing is loaded here, this runs on the event loop)
+    catalog, store = current_catalog(), current_skill_store()
+    if catalog is None or store is None:
+        return None
+    return f"{catalog.version[:16]}-{store.mtime}"
+
+def make_etag(version: str, path: str, query: str, session: str = "") -> str:
+    digest = hashlib.sha1(f"{version}|{path}|{query}|{session}".encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or etag.removeprefix("W/") in tags
+
+class ETagMiddleware:
+    """
+    The ETag is known before the route runs (catalog version + path + query string), so a
+    matching If-None-Match is answered with a 304 without building the response at all.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+
+        private = path.startswith(PRIVATE_PATHS)
+        if not private and not path.startswith(PUBLIC_PATHS):
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+        session = ""
+        if private:
+            session = hashlib.sha1(headers.get("cookie", "").encode("utf-8")).hexdigest()
+
+        try:
+            await crud_async.catalog_ready() # a changed workbook is reloaded on the crud pool
+            version = catalog_version()
+        except Exception as e:
+            print(f"Error computing ETag: {e}")
+            return await self.app(scope, receive, send)
+        if version is None:
+            # changed again meanwhile: served without an ETag
+            return await self.app(scope, receive, send)
+
+        etag = make_etag(version, path, scope.get("query_string", b"").decode("latin-1"), session)
+
+        cache_control = "private, no-cache" if private else "public, no-cache"
+
+        if etag_matches(headers.get("if-none-match", ""), etag):
+            response_headers = MutableHeaders()
+            response_headers["etag"] = etag
+            response_headers["cache-control"] = cache_control
+            response_headers["vary"] = "Cookie" if private else "Accept-Encoding"
+            await send({"type": "http.response.start", "status": 304, "headers": response_headers.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            # only successful responses are cacheable (not the redirects to the login page)
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                response_headers = MutableHeaders(scope=message)
+                response_headers["etag"] = etag
+                response_headers["cache-control"] = cache_control
+                if private:
+                    response_headers.add_vary_header("Cookie")
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+### --- gzip / brotli compression --- ###
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self.engine = brotli.Compressor()
+        else:
+            self.engine = zlib.compressobj(6, zlib.DEFLATED, 31) # wbits 31: gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        # flushed on every chunk, so a streamed response still reaches the client incrementally
+        if self.encoding == "br":
+            return self.engine.process(data) + self.engine.flush()
+        return self.engine.compress(data) + self.engine.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self.engine.finish() if self.encoding == "br" else self.engine.flush()
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    # "gzip, br;q=0.8, *;q=0" -> {"gzip": 1.0, "br": 0.8, "*": 0.0}
+    encodings = {}
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        encodings[name] = q
+    return encodings
+
+def choose_encoding(header: str) -> str | None:
+    # highest q-value wins, brotli on a tie; q=0 means "not acceptable"
+    encodings = accepted_encodings(header)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    weights = {name: encodings.get(name, encodings.get("*", 0.0)) for name in candidates}
+    best = max(candidates, key=lambda name: weights[name])
+    return best if weights[best] > 0 else None
+
+class CompressionMiddleware:
+    """
+    Brotli when the client accepts it and the package is installed, gzip otherwise.
+    Bodies under minimum_size, binary types and already-encoded responses are left alone.
+    """
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start = message # held back until the first body chunk tells us the size
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                headers = MutableHeaders(scope=start)
+                content_type = headers.get("content-type", "")
+                if ("content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES)
+                        or (not more_body and len(body) < self.minimum_size)):
+                    passthrough = True
+                    await send(start)
+                    return await send(message)
+
+                compressor = _Compressor(encoding)
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    # streamed: final size unknown, chunked transfer
+                    del headers["content-length"]
+                    await send(start)
+                    return await send({"type": "http.response.body", "body": compressor.chunk(body), "more_body": True})
+
+                compressed = compressor.chunk(body) + compressor.finish()
+                headers["content-length"] = str(len(compressed))
+                await send(start)
+                return await send({"type": "http.response.body", "body": compressed})
+
+            data = compressor.chunk(body)
+            if not more_body:
+                data += compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, compressing_send)
+
+### --- Static assets --- ###
+_static_versions: dict[str, str] = {}
+
+def static_url(path: str) -> str:
+    """
+    /static URL with a content version (?v=...), so the asset can be cached for a year and
+    still be refetched as soon as the file changes.
+    """
+    file_path = os.path.join("static", path.lstrip("/"))
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        return f"/static/{path.lstrip('/')}"
+
+    key = f"{file_path}:{mtime}"
+    if key not in _static_versions:
+        with open(file_path, "rb") as f:
+            _static_versions[key] = hashlib.sha1(f.read()).hexdigest()[:10]
+    return f"/static/{path.lstrip('/')}?v={_static_versions[key]}"
+
+class CachedStaticFiles(StaticFiles):
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if b"v=" in scope.get("query_string", b""):
+            response.headers["Cache-Control"] = f"public, max-age={STATIC_MAX_AGE}, immutable"
+        else:
+            # unversioned URL: cache briefly, then revalidate with the ETag/Last-Modified
+            response.headers["Cache-Control"] = "public, max-age=300"
+        return response
@@ -0,0 +1,107 @@
+import json
+from llm.rate_limit import estimate_tokens
+
+### --- Several roles in one request --- ###
+# The instructions are sent once per batch instead of once per role, and the answer is a
+# JSON object keyed by ISCO id, enforced with a response schema.
+
+BATCH_PROMPT_TEMPLATE = """
+    Act as a Technical HR Expert and Skills Analyst.
+
+    Analyze each of the following Job Roles and the associated list of Tasks.
+    For every role, extract the top 3-8 technical Hard Skills and/or Soft Skills required to perform these tasks.
+    For each skill, estimate the required proficiency level from 1 to 9 based on the complexity of the tasks.
+
+    Proficiency Scale:
+    1-3 = Beginner/Knowledge (Assist, Support, Execute basic tasks)
+    4-6 = Intermediate/Autonomous (Develop, Manage, Analyze, Solve problems)
+    7-9 = Expert/Strategic (Architect, Lead, Define Strategy, Mentor)
+
+    DATA TO ANALYZE:
+{roles}
+
+    REQUIRED OUTPUT:
+    Return ONLY a valid JSON object with one key per role ID, each value being the array of skills.
+    Example format:
+    {{
+        "2512": [
+            {{"skill": "Python", "level": 4, "reason": "Must create complex backend architectures"}}
+        ]
+    }}
+    """
+
+ROLE_BLOCK = """
+    [ID {id_key}] Role: {title_role}
+    Tasks/Description: {tasks}
+"""
+
+SKILL_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "skill": {"type": "STRING"},
+            "level": {"type": "INTEGER"},
+            "reason": {"type": "STRING"}
+        },
+        "required": ["skill", "level", "reason"]
+    }
+}
+
+PREAMBLE_TOKENS = estimate_tokens(BATCH_PROMPT_TEMPLATE)
+
+def build_batch_prompt(roles: list[tuple[str, str, str]]) -> str:
+    blocks = "".join(ROLE_BLOCK.format(id_key=id_key, title_role=title, tasks=tasks) for id_key, title, tasks in roles)
+    return BATCH_PROMPT_TEMPLATE.format(roles=blocks)
+
+def batch_schema(ids: list[str]) -> dict:
+    return {
+        "type": "OBJECT",
+        "properties": {id_key: SKILL_SCHEMA for id_key in ids},
+        "required": ids
+    }
+
+def is_skill_list(value) -> bool:
+    # a JSON array of {"skill": ..., "level": ..., "reason": ...} objects
+    return isinstance(value, list) and all(isinstance(item, dict) and "skill" in item for item in value)
+
+def parse_batch(text: str, ids: list[str]) -> dict[str, list[dict]]:
+    """
+    Returns {id: skills} for the ids that came back well-formed (the others are retried as
+    missing). Raises ValueError when the answer is not a JSON object at all.
+    """
+    clean_response = text.replace("```json", "").replace("```", "").strip()
+    answer = json.loads(clean_response)
+    if not isinstance(answer, dict):
+        raise ValueError("Expected a JSON object keyed by role ID")
+
+    return {
+        id_key: answer[id_key]
+        for id_key in ids
+        if is_skill_list(answer.get(id_key))
+    }
+
+def role_tokens(title: str, tasks: str, output_tokens: int) -> int:
+    return estimate_tokens(ROLE_BLOCK) + estimate_tokens(title) + estimate_tokens(tasks) + output_tokens
+
+def pack_batches(items: list, role_of, max_roles: int, token_budget: int, output_tokens: int) -> list[list]:
+    """
+    Greedy packing: a batch grows until it would exceed max_roles or the token budget
+    (prompt + expected answer). Long task texts therefore get smaller batches.
+    role_of(item) -> (title, tasks).
+    """
+    batches: list[list] = []
+    current: list = []
+    used = PREAMBLE_TOKENS
+
+    for item in items:
+        cost = role_tokens(*role_of(item), output_tokens)
+        if current and (len(current) >= max_roles or used + cost > token_budget):
+            batches.append(current)
+            current, used = [], PREAMBLE_TOKENS
+        current.append(item)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
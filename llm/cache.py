@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+CACHE_PATH = "data/.llm_cache.sqlite"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+def cache_key(template: str, model: str, temperature: float, *inputs: str) -> str:
+    """
+    Content address of one analysis: same template, model, temperature and inputs
+    -> same key, so the answer can be reused instead of paying for the call again.
+    """
+    payload = json.dumps(
+        {
+            "template": hashlib.sha256(template.encode("utf-8")).hexdigest(),
+            "model": model,
+            "temperature": temperature,
+            "inputs": list(inputs)
+        },
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+### --- Persistent LRU cache of LLM answers --- ###
+class AnalysisCache:
+    """
+    SQLite file mapping key -> parsed answer (JSON), capped at max_bytes: when the cap is
+    exceeded the least recently used entries are evicted.
+    """
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS answers_last_access ON answers(last_access)")
+        self._conn.commit()
+
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM answers").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        row = self._conn.execute("SELECT value FROM answers WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._conn.execute("UPDATE answers SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value):
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+
+        old = self._conn.execute("SELECT size FROM answers WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO answers (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, data, size, time.time())
+        )
+        self.total_bytes += size - (old[0] if old else 0)
+
+        self._evict()
+        self._conn.commit()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes:
+            rows = self._conn.execute("SELECT key, size FROM answers ORDER BY last_access LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+                self.total_bytes -= size
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        entries = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        return (f"Cache {self.path}: {s['hits']} hit, {s['misses']} miss (hit rate {s['hit_rate']:.0%}), "
+                f"{s['entries']} voci, {s['bytes'] / 1024:.0f}/{s['max_bytes'] / 1024:.0f} KiB, {s['evictions']} evictions")
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,90 @@
+import json
+import os
+
+### --- Append-only JSONL checkpoint of the batch job --- ###
+# One line per analysed role: {"id": "1111", "records": [...]}, flushed as soon as the
+# answer arrives. A crash or Ctrl-C loses at most the calls still in flight, and a rerun
+# skips every id already in the file.
+
+class Checkpoint:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def done_ids(self) -> set[str]:
+        # entries without records (empty answers of older runs) are left out of the output by compact(): analysed again
+        done = set()
+        for entry in self.entries():
+            if entry.get("records"):
+                done.add(entry["id"])
+        return done
+
+    def entries(self):
+        """
+        Streams the checkpoint line by line. A truncated last line (crash while writing)
+        is ignored: that role is simply analysed again.
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping corrupted checkpoint line: {line[:80]}")
+
+    def append(self, id_key: str, records: list[dict]):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+        self._file.write(json.dumps({"id": id_key, "records": records}, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def compact(self, output_path: str) -> int:
+        """
+        Writes the final {id: [records]} JSON straight from the checkpoint, one entry at a
+        time, so memory stays flat whatever the number of roles. If an id appears more than
+        once, the last answer wins. Roles with no skills are left out.
+        """
+        self.close()
+
+        # first pass: only remember where the last line of every id starts
+        offsets: dict[str, int] = {}
+        with open(self.path, "rb") as f:
+            while True:
+                position = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    offsets[json.loads(line)["id"]] = position
+                except (json.JSONDecodeError, KeyError):
+                    continue
+
+        written = 0
+        tmp_path = f"{output_path}.tmp"
+        with open(self.path, "rb") as source, open(tmp_path, "w", encoding="utf-8") as out:
+            out.write("{")
+            for id_key, position in offsets.items():
+                source.seek(position)
+                records = json.loads(source.readline())["records"]
+                if not records:
+                    continue
+
+                # ensure_ascii=False serve per salvare correttamente accenti e caratteri speciali
+                body = json.dumps(records, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+                out.write(("," if written else "") + f"\n    {json.dumps(id_key)}: {body}")
+                written += 1
+            out.write("\n}" if written else "}")
+
+        os.replace(tmp_path, output_path)
+        return written
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import random
+import re
+
+### --- Pluggable LLM clients --- ###
+# A client only needs `async def generate(prompt: str, schema: dict | None = None) -> str`
+# plus `model` and `temperature` attributes. `schema` asks for structured JSON output.
+
+class GeminiClient:
+    def __init__(self, api_key: str, model: str = "gemini-2.5-flash", temperature: float = 0.1):
+        from google import genai
+        from google.genai import types
+
+        self.model = model
+        self.temperature = temperature # Temperatura bassa per JSON più stabili
+        self._client = genai.Client(api_key=api_key)
+        self._types = types
+
+    async def generate(self, prompt: str, schema: dict | None = None) -> str:
+        if schema is None:
+            config = self._types.GenerateContentConfig(temperature=self.temperature)
+        else:
+            config = self._types.GenerateContentConfig(
+                temperature=self.temperature,
+                response_mime_type="application/json",
+                response_schema=schema
+            )
+
+        response = await self._client.aio.models.generate_content(model=self.model, contents=prompt, config=config)
+        return response.text or ""
+
+class StubClient:
+    """
+    Offline client for testing the pipeline: answers with a deterministic skill list
+    built from the role(s) in the prompt. `latency` and `failure_rate` simulate a real API,
+    `malformed_rate` returns broken JSON for batch prompts.
+    """
+    def __init__(self, latency: float = 0.05, failure_rate: float = 0.0, malformed_rate: float = 0.0, seed: int = 0):
+        self.model = "stub"
+        self.temperature = 0.0
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def generate(self, prompt: str, schema: dict | None = None) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+        if self._random.random() < self.failure_rate:
+            raise RuntimeError("stub: simulated API error")
+
+        batch = re.findall(r"\[ID (\S+)\] Role: (.*)", prompt)
+        if batch:
+            if len(batch) > 1 and self._random.random() < self.malformed_rate:
+                return '{"' + batch[0][0] + '": [{"skill": '
+            return json.dumps({id_key: self._skills(role.strip()) for id_key, role in batch})
+
+        match = re.search(r"Role: (.*)", prompt)
+        role = match.group(1).strip() if match else "Unknown role"
+        return "```json\n" + json.dumps(self._skills(role)) + "\n```"
+
+    def _skills(self, role: str) -> list[dict]:
+        words = re.findall(r"[A-Za-z]{5,}", role) or ["General"]
+        skills = [
+            {"skill": f"{word.capitalize()} Knowledge", "level": 3 + (len(word) % 5), "reason": f"Stub skill for {role}"}
+            for word in words[:3]
+        ]
+        skills.append({"skill": "Communication", "level": 4, "reason": f"Stub skill for {role}"})
+        return skills
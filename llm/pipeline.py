@@ -0,0 +1,220 @@
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+from llm.batching import BATCH_PROMPT_TEMPLATE, build_batch_prompt, batch_schema, parse_batch, pack_batches, is_skill_list
+from llm.cache import cache_key
+from llm.rate_limit import RateLimiter, estimate_tokens
+
+# expected answer size, counted against the tokens/min quota together with the prompt
+OUTPUT_TOKENS_ESTIMATE = 400
+
+PROMPT_TEMPLATE = """
+    Act as a Technical HR Expert and Skills Analyst.
+    
+    Analyze the following Job Role and the associated list of Tasks.
+    Extract the top 3-8 technical Hard Skills and/or Soft Skills required to perform these tasks.
+    For each skill, estimate the required proficiency level from 1 to 9 based on the complexity of the tasks.
+    
+    Proficiency Scale:
+    1-3 = Beginner/Knowledge (Assist, Support, Execute basic tasks)
+    4-6 = Intermediate/Autonomous (Develop, Manage, Analyze, Solve problems)
+    7-9 = Expert/Strategic (Architect, Lead, Define Strategy, Mentor)
+
+    DATA TO ANALYZE:
+    Role: {title_role}
+    Tasks/Description: {tasks}
+
+    REQUIRED OUTPUT:
+    Return ONLY a valid JSON array (no markdown blocks ```json).
+    Example format:
+    [
+        {{"skill": "Python", "level": 4, "reason": "Must create complex backend architectures"}},
+        {{"skill": "Project Management", "level": 2, "reason": "Supports the PM in management tasks"}}
+    ]
+    """
+
+@dataclass
+class PipelineConfig:
+    concurrency: int = 4
+    requests_per_minute: float = 40 # the old serial loop slept 1.5 s between calls
+    tokens_per_minute: float = 250_000
+    max_retries: int = 5
+    backoff_base: float = 1.0 # seconds, doubled at every retry
+    backoff_max: float = 60.0
+    batch_size: int = 1 # roles per request, 1 = one role per request (no batching)
+    batch_token_budget: int = 16_000 # prompt + expected answer, per request
+
+def build_prompt(title_role: str, tasks: str) -> str:
+    return PROMPT_TEMPLATE.format(title_role=title_role, tasks=tasks)
+
+def parse_skills(text: str) -> list[dict]:
+    # Pulizia della risposta
+    clean_response = text.replace("```json", "").replace("```", "").strip()
+    if not clean_response:
+        return []
+
+    skills = json.loads(clean_response)
+    if not isinstance(skills, list):
+        raise ValueError("Expected a JSON array of skills")
+    # raised here, not in to_records(): a malformed answer goes through the retries like any parse error
+    if not is_skill_list(skills):
+        raise ValueError("Expected every skill to be an object with a \"skill\" key")
+    return skills
+
+def to_records(title_role: str, skills: list[dict]) -> list[dict]:
+    return [
+        {
+            "Role Title": title_role, # Utile tenerlo per contesto
+            "Skill": s.get("skill"),
+            "Required Level": s.get("level"),
+            "Reason": s.get("reason")
+        }
+        for s in skills
+    ]
+
+class ParseError(ValueError):
+    pass
+
+### --- One call with rate limiting and retries --- ###
+async def call_with_retries(client, limiter: RateLimiter, prompt: str, config: PipelineConfig, label: str,
+                            parse=parse_skills, schema: dict | None = None, output_tokens: int = OUTPUT_TOKENS_ESTIMATE,
+                            retry_parse_errors: bool = True):
+    """
+    Sends the prompt and parses the answer. API errors (and, unless retry_parse_errors is
+    False, unparsable answers) are retried with exponential backoff plus jitter; after
+    max_retries the error is raised. An unparsable answer raises ParseError.
+    """
+    tokens = estimate_tokens(prompt) + output_tokens
+
+    for attempt in range(config.max_retries + 1):
+        await limiter.acquire(tokens)
+        try:
+            text = await client.generate(prompt, schema=schema)
+            try:
+                return parse(text)
+            except Exception as e:
+                raise ParseError(str(e)) from e
+        except Exception as e:
+            if attempt == config.max_retries or (isinstance(e, ParseError) and not retry_parse_errors):
+                raise
+
+            delay = min(config.backoff_max, config.backoff_base * 2 ** attempt) * (0.5 + random.random() / 2)
+            print(f"Retry {attempt + 1}/{config.max_retries} for {label} in {delay:.1f}s: {e}")
+            await asyncio.sleep(delay)
+
+### --- Whole catalog --- ###
+async def run_pipeline(rows: list[tuple[str, str, str]], client, config: PipelineConfig, on_result, cache=None) -> dict[str, int]:
+    """
+    rows: (ISCO id, role title, tasks). Runs up to `concurrency` calls at a time within the
+    quotas. Every answer is handed to on_result(id, records) as soon as it arrives (nothing is
+    accumulated here); roles that still fail after the retries are not reported, so a rerun
+    tries them again.
+
+    Rows with the same (title, tasks) share a single request, and with a cache
+    (llm.cache.AnalysisCache) answers already paid for in earlier runs are reused.
+    With batch_size > 1 several roles are packed in one request (see llm/batching.py).
+    """
+    limiter = RateLimiter(config.requests_per_minute, config.tokens_per_minute)
+    semaphore = asyncio.Semaphore(config.concurrency)
+    stats = {"analysed": 0, "failed": 0, "api_calls": 0, "cached": 0, "deduplicated": 0, "splits": 0}
+    batching = config.batch_size > 1
+    template = BATCH_PROMPT_TEMPLATE if batching else PROMPT_TEMPLATE
+
+    # collapsing duplicate inputs: one request per distinct key, fanned out to every row
+    groups: dict[str, list[tuple[str, str, str]]] = {}
+    for id_key, role, tasks in rows:
+        key = cache_key(template, client.model, client.temperature, role, tasks)
+        groups.setdefault(key, []).append((id_key, role, tasks))
+    stats["deduplicated"] = len(rows) - len(groups)
+
+    def deliver(key: str, skills: list[dict], from_cache: bool = False):
+        if cache is not None and not from_cache and skills:
+            cache.set(key, skills) # only validated, non-empty answers: a blocked answer is asked again next run
+
+        if not skills:
+            # empty answer (e.g. blocked by the safety filters): not checkpointed, so a rerun asks again
+            fail(key, groups[key][0][1], ValueError("empty answer"))
+            return
+
+        for id_key, role, _ in groups[key]:
+            stats["analysed"] += 1
+            print(f" -> [{stats['analysed'] + stats['failed']}/{len(rows)}] ID {id_key}: {role} ({len(skills)} skills)")
+            on_result(id_key, to_records(role, skills))
+
+    def fail(key: str, role: str, error: Exception):
+        print(f"Fail to analyse {role}: {error}")
+        stats["failed"] += len(groups[key])
+
+    pending = []
+    for key in groups:
+        skills = cache.get(key) if cache is not None else None
+        if not skills:
+            # not cached, or an empty answer cached by an older run
+            pending.append(key)
+        else:
+            stats["cached"] += 1
+            deliver(key, skills, from_cache=True)
+
+    async def analyse(key: str):
+        id_key, role, tasks = groups[key][0]
+
+        async with semaphore:
+            try:
+                stats["api_calls"] += 1
+                skills = await call_with_retries(client, limiter, build_prompt(role, tasks), config, f"ID {id_key}")
+            except Exception as e:
+                fail(key, role, e)
+                return
+
+        deliver(key, skills)
+
+    async def analyse_batch(keys: list[str]):
+        roles = {groups[key][0][0]: key for key in keys} # ISCO id -> key
+        ids = list(roles)
+        prompt = build_batch_prompt([groups[key][0] for key in keys])
+
+        async with semaphore:
+            try:
+                stats["api_calls"] += 1
+                answers = await call_with_retries(
+                    client, limiter, prompt, config, f"batch of {len(keys)} from ID {ids[0]}",
+                    parse=lambda text: parse_batch(text, ids),
+                    schema=batch_schema(ids),
+                    output_tokens=OUTPUT_TOKENS_ESTIMATE * len(keys),
+                    retry_parse_errors=len(keys) == 1
+                )
+            except ParseError as e:
+                answers = {}
+                if len(keys) == 1:
+                    fail(keys[0], groups[keys[0]][0][1], e)
+                    return
+            except Exception as e:
+                for key in keys:
+                    fail(key, groups[key][0][1], e)
+                return
+
+        for id_key, skills in answers.items():
+            deliver(roles[id_key], skills)
+
+        # roles missing from the answer (or the whole batch unparsable): retried in two halves
+        missing = [roles[id_key] for id_key in ids if id_key not in answers]
+        if missing:
+            if len(keys) == 1:
+                fail(keys[0], groups[keys[0]][0][1], ValueError("role missing from the answer"))
+            elif len(missing) == 1:
+                await analyse_batch(missing)
+            else:
+                stats["splits"] += 1
+                half = len(missing) // 2
+                await asyncio.gather(analyse_batch(missing[:half]), analyse_batch(missing[half:]))
+
+    if batching:
+        batches = pack_batches(
+            pending, lambda key: groups[key][0][1:], config.batch_size, config.batch_token_budget, OUTPUT_TOKENS_ESTIMATE
+        )
+        await asyncio.gather(*(analyse_batch(batch) for batch in batches))
+    else:
+        await asyncio.gather(*(analyse(key) for key in pending))
+
+    return stats
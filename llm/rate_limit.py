@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+### --- Token bucket rate limiting (requests/min and tokens/min quotas) --- ###
+class TokenBucket:
+    """
+    Refills at `per_minute / 60` units per second, holding at most `burst_seconds` worth
+    of units, so we never fire a whole minute of quota at once.
+    """
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity) # a single huge request must still get through
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+class RateLimiter:
+    """
+    Both quotas must allow the call before it starts.
+    """
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int):
+        # one caller at a time, so waiting callers are served in order
+        async with self._lock:
+            while True:
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if wait <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    return
+                await asyncio.sleep(wait)
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text, good enough for quota accounting
+    return max(1, len(text) // 4)
@@ -1,140 +1,121 @@
-import pandas as pd
-from google import genai
-from google.genai import types
+import argparse
+import asyncio
 import json
+import os
+import sys
 import time
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm.cache import AnalysisCache, CACHE_PATH, DEFAULT_MAX_BYTES
+from llm.checkpoint import Checkpoint
+from llm.clients import GeminiClient, StubClient
+from llm.pipeline import PipelineConfig, run_pipeline
 
 # --- SETTING ---
-API_KEY = "CURRENT_KEY" 
+API_KEY = os.getenv("GEMINI_API_KEY", "CURRENT_KEY")
+MODEL = "gemini-2.5-flash"
 
 FILE_INPUT = "data/ISCO-08 EN Structure and definitions.xlsx"
 FILE_OUTPUT = "skill_models.json"
 
-# --- SETTING Gemini
-client = genai.Client(api_key=API_KEY)
-
-def analyse_with_gemini(title_role, tasks):
-    """
-    Sharing data with Gemini and asking for Skill Models.
-    """
-    prompt = f"""
-    Act as a Technical HR Expert and Skills Analyst.
-    
-    Analyze the following Job Role and the associated list of Tasks.
-    Extract the top 3-8 technical Hard Skills and/or Soft Skills required to perform these tasks.
-    For each skill, estimate the required proficiency level from 1 to 9 based on the complexity of the tasks.
-    
-    Proficiency Scale:
-    1-3 = Beginner/Knowledge (Assist, Support, Execute basic tasks)
-    4-6 = Intermediate/Autonomous (Develop, Manage, Analyze, Solve problems)
-    7-9 = Expert/Strategic (Architect, Lead, Define Strategy, Mentor)
-
-    DATA TO ANALYZE:
-    Role: {title_role}
-    Tasks/Description: {tasks}
-
-    REQUIRED OUTPUT:
-    Return ONLY a valid JSON array (no markdown blocks ```json).
-    Example format:
-    [
-        {{"skill": "Python", "level": 4, "reason": "Must create complex backend architectures"}},
-        {{"skill": "Project Management", "level": 2, "reason": "Supports the PM in management tasks"}}
-    ]
-    """
-
-    try:
-        # --- CHIAMATA API (NUOVA SINTASSI) ---
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                temperature=0.1 # Temperatura bassa per JSON più stabili
-            )
-        )
-        
-        # Pulizia della risposta
-        if response.text:
-            clean_response = response.text.replace("```json", "").replace("```", "").strip()
-            return json.loads(clean_response)
-        else:
-            return []
-            
-    except Exception as e:
-        print(f"Fail to analyse {title_role}: {e}")
-        return []
-
-# --- EXECUTION ---
-
-print("Caricamento Excel...")
-try:
-    df = pd.read_excel(FILE_INPUT)
-except FileNotFoundError:
-    print(f"Errore: Il file {FILE_INPUT} non è stato trovato.")
-    exit()
-
 col_titolo = 'Title EN'      # Colonna C
 col_tasks = 'Tasks include'  # Colonna E
 
-# Assicuriamoci che i dati siano stringhe e le colonne esistano
-if col_titolo in df.columns and col_tasks in df.columns:
-    df[col_tasks] = df[col_tasks].astype(str)
-    df[col_titolo] = df[col_titolo].astype(str)
-else:
-    print(f"Errore: Colonne '{col_titolo}' o '{col_tasks}' non trovate.")
-    exit()
-
-results = {}
-
-print(f"Inizio analisi di {len(df)} righe totali...")
-
-# --- TEST MODE ---
-# Analizza solo le prime 5 righe. Se funziona, commenta questa riga per fare tutto.
-# df = df.head(5) 
-# print("⚠️ MODALITÀ TEST ATTIVA: Analizzo solo le prime 5 righe.")
-# -----------------
-
-# 2. Ciclo su ogni riga
-for index, row in df.iterrows():
-    # Prendi l'ID dalla Colonna B (indice 1)
-    id_excel = row.iloc[1]
-    id_key = str(id_excel) # string conversion
-    
-    role = row[col_titolo]      
-    tasks = row[col_tasks]    
-    
-    print(f" -> Analizzando ID {id_excel}: {role}...")
-    
-    # Chiamata a Gemini
-    skills_estratte = analyse_with_gemini(role, tasks)
-    
-    if skills_estratte:
-        if id_key not in results:
-            results[id_key] = []
-            
-        # Aggiungiamo le skill alla lista di questo ID
-        for s in skills_estratte:
-            results[id_key].append({
-                "Role Title": role,  # Utile tenerlo per contesto
-                "Skill": s.get('skill'),
-                "Required Level": s.get('level'),
-                "Reason": s.get('reason')
-            })
-    
-    time.sleep(1.5)
-
-# 4. Salvataggio risultati
-print("Salvataggio risultati...")
-
-if results:
-    with open(FILE_OUTPUT, 'w', encoding='utf-8') as f:
-        # ensure_ascii=False serve per salvare correttamente accenti e caratteri speciali
-        json.dump(results, f, indent=4, ensure_ascii=False)
-        
-    print(f"✅ Fatto! File salvato come: {FILE_OUTPUT}")
-    
-    # Esempio di come leggere il primo ID trovato
-    first_id = list(results.keys())[0]
-    print(f"Esempio struttura per ID {first_id}:")
-    print(results[first_id][0])
-else:
-    print("⚠️ Nessun risultato da salvare.")
+def load_rows(limit: int | None = None) -> list[tuple[str, str, str]]:
+    print("Caricamento Excel...")
+    try:
+        # dtype=str keeps the leading zero of the armed forces codes ("0110")
+        df = pd.read_excel(FILE_INPUT, dtype=str)
+    except FileNotFoundError:
+        print(f"Errore: Il file {FILE_INPUT} non è stato trovato.")
+        sys.exit(1)
+
+    # Assicuriamoci che i dati siano stringhe e le colonne esistano
+    if col_titolo in df.columns and col_tasks in df.columns:
+        df[col_tasks] = df[col_tasks].fillna("").astype(str)
+        df[col_titolo] = df[col_titolo].fillna("").astype(str)
+    else:
+        print(f"Errore: Colonne '{col_titolo}' o '{col_tasks}' non trovate.")
+        sys.exit(1)
+
+    # --- TEST MODE ---
+    if limit:
+        df = df.head(limit)
+        print(f"⚠️ MODALITÀ TEST ATTIVA: Analizzo solo le prime {limit} righe.")
+
+    # ID dalla Colonna B (indice 1), string conversion
+    return [(str(row.iloc[1]), row[col_titolo], row[col_tasks]) for _, row in df.iterrows()]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract skill models for every ISCO-08 role.")
+    parser.add_argument("--stub", action="store_true", help="use the offline stub client instead of Gemini")
+    parser.add_argument("--limit", type=int, default=None, help="analyse only the first N rows")
+    parser.add_argument("--concurrency", type=int, default=PipelineConfig.concurrency)
+    parser.add_argument("--rpm", type=float, default=PipelineConfig.requests_per_minute, help="requests per minute quota")
+    parser.add_argument("--tpm", type=float, default=PipelineConfig.tokens_per_minute, help="tokens per minute quota")
+    parser.add_argument("--retries", type=int, default=PipelineConfig.max_retries)
+    parser.add_argument("--batch-size", type=int, default=PipelineConfig.batch_size, help="max roles per request (1 = no batching)")
+    parser.add_argument("--batch-token-budget", type=int, default=PipelineConfig.batch_token_budget, help="max tokens (prompt + answer) per request")
+    parser.add_argument("--output", default=FILE_OUTPUT)
+    parser.add_argument("--cache", default=CACHE_PATH, help="persistent cache of the answers")
+    parser.add_argument("--cache-size-mb", type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--checkpoint", default=None, help="JSONL checkpoint (default: <output>.checkpoint.jsonl)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    client = StubClient() if args.stub else GeminiClient(API_KEY, model=MODEL)
+    config = PipelineConfig(
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        max_retries=args.retries,
+        batch_size=args.batch_size,
+        batch_token_budget=args.batch_token_budget
+    )
+
+    rows = load_rows(args.limit)
+
+    # Riprendi dal checkpoint: ogni ID già analizzato viene saltato
+    checkpoint = Checkpoint(args.checkpoint or os.path.splitext(args.output)[0] + ".checkpoint.jsonl")
+    done = checkpoint.done_ids()
+    todo = [row for row in rows if row[0] not in done]
+    if done:
+        print(f"Checkpoint {checkpoint.path}: {len(done)} ID già fatti, ne restano {len(todo)}.")
+
+    print(f"Inizio analisi di {len(todo)} righe ({config.concurrency} in parallelo, {config.requests_per_minute:.0f} req/min)...")
+
+    cache = None if args.no_cache else AnalysisCache(args.cache, int(args.cache_size_mb * 1024 * 1024))
+
+    start = time.perf_counter()
+    try:
+        stats = asyncio.run(run_pipeline(todo, client, config, on_result=checkpoint.append, cache=cache))
+    except KeyboardInterrupt:
+        print(f"\n⚠️ Interrotto. I risultati sono salvati in {checkpoint.path}: rilancia lo script per riprendere.")
+        sys.exit(1)
+    finally:
+        checkpoint.close()
+        if cache is not None:
+            print(cache.report())
+            cache.close()
+
+    print(f"Analisi completata in {time.perf_counter() - start:.1f}s: {stats['analysed']} ok, {stats['failed']} falliti")
+    print(f"Chiamate API: {stats['api_calls']} (dalla cache: {stats['cached']}, duplicati accorpati: {stats['deduplicated']})")
+    if stats["failed"]:
+        print("⚠️ Rilancia lo script per riprovare solo le righe fallite.")
+
+    # Salvataggio risultati: compattazione del checkpoint nel JSON finale
+    print("Salvataggio risultati...")
+    written = checkpoint.compact(args.output)
+
+    if written:
+        print(f"✅ Fatto! {written} ID salvati in: {args.output}")
+    else:
+        print("⚠️ Nessun risultato da salvare.")
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,114 @@
+import time
+IMPORT_STARTED = time.perf_counter() # the startup budget counts the imports below
+
+from contextlib import asynccontextmanager, contextmanager
 from fastapi import FastAPI, Request, status
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
-from config import templates
+from fastapi.responses import HTMLResponse, RedirectResponse, PlainTextResponse
+from config import templates, SLOW_REQUEST_MS, STARTUP_BUDGET_MS
+from http_cache import ETagMiddleware, CompressionMiddleware, CachedStaticFiles, static_url
+from catalog.store import load_catalog
+from catalog.shared import process_memory
+from skills.store import load_skill_store
+from cache import user_cache, org_cache, fragment_cache
+from metrics import MetricsMiddleware, render_metrics, render_gauges, timed
+from security import pending_hashes, warm_up
+
+from routers import user, org, guest, roles, skills, search
+
+### --- Startup --- ###
+# milliseconds spent in each startup phase (/api/stats/startup)
+startup_ms: dict[str, float] = {}
+
+def precompile_templates() -> int:
+    # compiled once into the Jinja cache instead of on the first render of each page
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.env.get_template(name)
+    return len(names)
+
+@contextmanager
+def startup_phase(phase: str):
+    started = time.perf_counter()
+    with timed(f"startup.{phase}"):
+        yield
+    startup_ms[phase] = (time.perf_counter() - started) * 1000
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup_ms["imports"] = (time.perf_counter() - IMPORT_STARTED) * 1000
+
+    # warm-up: everything the first request would otherwise pay for
+    with startup_phase("catalog"):
+        # ISCO-08 catalog and skill models, shared by every request
+        load_catalog()
+        load_skill_store()
+    with startup_phase("templates"):
+        precompile_templates()
+    with startup_phase("hashing"):
+        await warm_up()
+    startup_ms["ready"] = (time.perf_counter() - IMPORT_STARTED) * 1000
 
-from routers import user, org, guest
+    print("Startup: " + ", ".join(f"{phase} {ms:.0f} ms" for phase, ms in startup_ms.items()) + f" (budget {STARTUP_BUDGET_MS:.0f} ms)")
+    if startup_ms["ready"] > STARTUP_BUDGET_MS:
+        print(f"Warning: worker ready after {startup_ms['ready']:.0f} ms, over the STARTUP_BUDGET_MS of {STARTUP_BUDGET_MS:.0f} ms")
 
-app = FastAPI()
+    # the catalog pages are mapped from data/.snapshot and shared with the other workers
+    memory = process_memory()
+    print(f"Worker {memory['pid']} ready: " + ", ".join(f"{key} {value}" for key, value in memory.items() if key != "pid"))
+    yield
 
-# Setting static materials (CSS, images)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app = FastAPI(lifespan=lifespan)
+
+# Setting static materials (CSS, images): versioned URLs from static_url() are cached for a year
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
+templates.env.globals["static_url"] = static_url
+
+# Conditional GETs on catalog data, then compression of whatever is sent
+app.add_middleware(ETagMiddleware)
+app.add_middleware(CompressionMiddleware)
+
+# Outermost: latency of the whole request, compression included
+app.add_middleware(MetricsMiddleware, slow_ms=SLOW_REQUEST_MS)
 
 # Linking routers to main file
 app.include_router(user.router)
 app.include_router(org.router)
 app.include_router(guest.router)
+app.include_router(roles.router)
+app.include_router(skills.router)
+app.include_router(search.router)
 
 ### --- Root --- ###
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
+### --- Cache counters --- ###
+@app.get("/api/stats/cache")
+async def cache_stats():
+    return {"users": user_cache.stats(), "organizations": org_cache.stats(), "search_fragments": fragment_cache.stats()}
+
+### --- Prometheus metrics --- ###
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    caches = {"users": user_cache, "organizations": org_cache, "search_fragments": fragment_cache}
+    lines = render_gauges("app_cache_hit_rate", "Hit rate of the in-process caches.",
+                          {(("cache", name),): cache.stats()["hit_rate"] for name, cache in caches.items()})
+    lines += render_gauges("app_pending_hashes", "Argon2 calls running or queued.", {(): pending_hashes()})
+    lines += render_gauges("app_startup_seconds", "Time spent in each startup phase.",
+                           {(("phase", phase),): ms / 1000 for phase, ms in startup_ms.items()})
+    return PlainTextResponse(render_metrics() + "\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+### --- Startup phases of this worker --- ###
+@app.get("/api/stats/startup")
+async def startup_stats():
+    return {**startup_ms, "budget": STARTUP_BUDGET_MS}
+
+### --- Resident memory of this worker --- ###
+@app.get("/api/stats/memory")
+async def memory_stats():
+    return process_memory()
+
 ### --- Logout --- ###
 @app.get("/logout")
 async def logout(request: Request):
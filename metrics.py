@@ -0,0 +1,145 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+import jinja2
+from starlette.routing import Match
+
+### --- Prometheus-style histograms --- ###
+# seconds; from sub-millisecond lookups up to a cold Excel parse
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Histogram:
+    """
+    Cumulative-bucket histogram per label set, rendered in the Prometheus text format.
+    One observation is a bisect and a few additions under a lock.
+    """
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...], buckets: tuple = BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {} # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, seconds: float):
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            if i < len(self.buckets):
+                series[i] += 1 # made cumulative when rendered
+            series[-2] += seconds
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+
+        for labels, values in sorted(series.items()):
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            prefix = f"{label_text}," if label_text else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {values[-1]}')
+            suffix = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{self.name}_sum{suffix} {values[-2]:.6f}")
+            lines.append(f"{self.name}_count{suffix} {values[-1]}")
+        return lines
+
+request_seconds = Histogram("http_request_duration_seconds", "Request latency by route.", ("method", "route", "status"))
+phase_seconds = Histogram("app_phase_duration_seconds", "Time spent in crud, hashing and template rendering.", ("phase",))
+
+def render_gauges(name: str, description: str, values: dict[tuple[tuple[str, str], ...], float]) -> list[str]:
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} gauge"]
+    for labels, value in values.items():
+        label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+        lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+    return lines
+
+def render_metrics() -> str:
+    return "\n".join(request_seconds.render() + phase_seconds.render()) + "\n"
+
+### --- Phase timers --- ###
+# phase -> seconds for the request being served; None outside a request
+_request_phases: ContextVar[dict | None] = ContextVar("request_phases", default=None)
+
+@contextmanager
+def timed(phase: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        phase_seconds.observe((phase,), elapsed)
+        phases = _request_phases.get()
+        if phases is not None:
+            phases[phase] = phases.get(phase, 0.0) + elapsed
+
+class TimedTemplate(jinja2.Template):
+    # every render (full pages and cached fragments) is timed under template.<name>
+    def render(self, *args, **kwargs) -> str:
+        with timed(f"template.{self.name}"):
+            return super().render(*args, **kwargs)
+
+### --- Request middleware --- ###
+def match_route(scope) -> str | None:
+    # route template for requests answered before the router ran (e.g. the 304s of ETagMiddleware)
+    router = getattr(scope.get("app"), "router", None)
+    for route in getattr(router, "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", None)
+    return None
+
+class MetricsMiddleware:
+    """
+    Latency histogram per (method, route template, status). Requests slower than slow_ms
+    (0 = never) are printed with the time spent in each phase.
+    """
+    def __init__(self, app, slow_ms: float = 0):
+        self.app = app
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status_code = 500
+        phases: dict[str, float] = {}
+        token = _request_phases.set(phases)
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_phases.reset(token)
+
+            # route template, not the raw path: /details/{role_id} is one series, not 600
+            route = scope.get("route")
+            if route is not None:
+                route_name = getattr(route, "path", "unknown")
+            elif scope["path"].startswith("/static/"):
+                route_name = "/static"
+            else:
+                route_name = match_route(scope) or "unmatched"
+            request_seconds.observe((scope["method"], route_name, str(status_code)), elapsed)
+
+            if self.slow_ms and elapsed * 1000 >= self.slow_ms:
+                breakdown = ", ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in sorted(phases.items(), key=lambda p: -p[1]))
+                print(f"Slow request: {scope['method']} {scope['path']} -> {status_code} in {elapsed * 1000:.1f} ms ({breakdown or 'no timed phase'})")
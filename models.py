@@ -9,6 +9,9 @@ class User(BaseModel):
     email: EmailStr
     hashed_password: str
     target_roles: Optional[list[str]] = None
+    skills: Optional[dict[str, int]] = None # declared proficiency, skill name -> level 1-9
+    organizations: Optional[list[str]] = None # orgnames the user agreed to share the profile with
+    invitations: Optional[list[str]] = None # orgnames waiting for the user's answer
 
 class Organization(BaseModel):
     name: str
@@ -17,9 +20,64 @@ class Organization(BaseModel):
     email: EmailStr
     orgname: str
     hashed_password: str
+    members: Optional[list[str]] = None # usernames of the employees (invitation accepted)
+    invited: Optional[list[str]] = None # usernames invited, not members until they accept
 
 class Role(BaseModel):
-    id: int
+    id: str # ISCO code, kept as text: armed forces codes start with 0 (e.g. "0110")
     title: str
     definition: str
     task: str
+
+class SkillRequirement(BaseModel):
+    skill: str
+    level: int # required proficiency, 1-9
+    reason: str
+
+class SkillGap(BaseModel):
+    skill: str
+    required: int
+    current: int
+    gap: int
+
+class RoleGap(BaseModel):
+    role_id: str
+    title: str
+    coverage: float # 0-1, share of the required levels already reached
+    gaps: list[SkillGap]
+
+class MissingSkill(BaseModel):
+    skill: str
+    total_gap: int # summed over the target roles
+    max_required: int
+    roles: int # how many target roles need it
+
+class SkillGapReport(BaseModel):
+    roles: list[RoleGap]
+    missing_skills: list[MissingSkill]
+    overall_coverage: float
+
+class OrgSkillGap(BaseModel):
+    skill: str
+    total_gap: int # summed over the members
+    members: int # members below the required level
+    mean_gap: float # over the members with target roles
+
+class OrgRoleGap(BaseModel):
+    role_id: str
+    title: str
+    members: int # members targeting the role
+    coverage: float
+    top_gaps: list[OrgSkillGap]
+
+class OrgHeatmap(BaseModel):
+    roles: list[str] # row labels (role titles)
+    skills: list[str] # column labels
+    values: list[list[float]] # mean gap of the role's members for each skill
+
+class OrgAnalytics(BaseModel):
+    members: int
+    members_with_targets: int
+    top_gaps: list[OrgSkillGap]
+    role_gaps: list[OrgRoleGap]
+    heatmap: OrgHeatmap
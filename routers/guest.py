@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse
 from config import templates
-import crud
+from fragments import render_search_results
 
 router = APIRouter()
 
@@ -12,18 +12,12 @@ async def gust_home(request: Request):
 
 ### --- Obtain skills from Guest Input --- ###
 @router.post("/extract_general_skill_models", response_class=HTMLResponse)
-async def extract_general_skill_models(request: Request, search: str = Form(...)):
-    role = search.title().strip()
+async def extract_general_skill_models(request: Request, search: str = Form(...), page: int = Form(1)):
+    # rendered result list, cached per query and page (see fragments.py)
+    results_html = await render_search_results(search, page, link_details=False)
 
-    extracted_models = {}
-
-    skill_models_list = crud.extracting_skill_models(role)
-    if skill_models_list:
-        extracted_models[role] = skill_models_list
-    
-    
     return templates.TemplateResponse("guest_home.html", {
         "request": request,
-        "results": extracted_models,
+        "results_html": results_html,
         "last_search": search
-    })
\ No newline at end of file
+    })
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Request, Form, status, Depends
+from fastapi import APIRouter, Request, Form, status, Depends, HTTPException, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from pydantic import EmailStr
 from dependencies import get_current_org
 
-from config import templates, pwd_context
-import crud
+from config import templates
+from security import hash_password, verify_password, verify_and_update
+import crud_async
 from models import Organization
 
 router = APIRouter()
@@ -24,14 +25,22 @@ async def org_login(request: Request):
 
 @router.post("/org_login", response_class=HTMLResponse)
 async def org_login(request: Request, orgname: str = Form(...), password: str = Form(...)):
-    org = crud.get_organization(orgname)
+    org = await crud_async.get_organization(orgname)
 
-    if not org or not pwd_context.verify(password, org.hashed_password):
+    verified, new_hash = (False, None)
+    if org:
+        verified, new_hash = await verify_and_update(password, org.hashed_password)
+
+    if not verified:
         response = RedirectResponse(url="/org_login", status_code=status.HTTP_303_SEE_OTHER)
         
         response.set_cookie(key="flash_error", value="Invalid credentials. Please try again.")
         return response
 
+    # stored hash made with outdated Argon2 parameters: replacing it now that we know the password
+    if new_hash:
+        await crud_async.change_password_org(org, new_hash)
+
     response = RedirectResponse(url="/org_home", status_code=status.HTTP_303_SEE_OTHER)
 
     response.set_cookie(key="session_token", value=org.orgname, path="/", httponly=True, max_age=1800)  # 30 minutes session
@@ -76,10 +85,10 @@ async def register_org(
     orgname: str = Form(...),
     password: str = Form(...)
 ):
-    hashed_pw = pwd_context.hash(password)
+    hashed_pw = await hash_password(password)
     new_org = Organization(name=name, address=address, phone=phone, email=email, orgname=orgname, hashed_password=hashed_pw)
     try:
-        crud.create_organization(new_org)
+        await crud_async.create_organization(new_org)
         return RedirectResponse(url="/org_login", status_code=status.HTTP_303_SEE_OTHER)
     except ValueError:
         return templates.TemplateResponse("org/org_register.html", {
@@ -95,10 +104,15 @@ async def org_profile(request: Request, org = Depends(get_current_org)):
         response.set_cookie("session_token", value="", path="/", httponly=True, max_age=0)
         return response
 
+    analytics = await crud_async.get_org_analytics(org)
+    member_error = request.cookies.get("flash_error")
+
     response = templates.TemplateResponse(
         "org/org_profile.html", 
-        {"request": request, "org": org}
+        {"request": request, "org": org, "analytics": analytics, "member_error": member_error}
     )
+    if member_error:
+        response.delete_cookie("flash_error")
 
     # No cache storage
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
@@ -114,23 +128,25 @@ async def change_password(request: Request, org = Depends(get_current_org), old_
     if not org:
         return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
     
-    if not pwd_context.verify(old_pw, org.hashed_password):
+    if not await verify_password(old_pw, org.hashed_password):
         error = "Your old password is not correct."
         return templates.TemplateResponse("org/org_profile.html", {
             "request": request,
-            "usorger": org,
+            "org": org,
+            "analytics": await crud_async.get_org_analytics(org),
             "wrong_pw": error
         })
     
-    new_pw_hashed = pwd_context.hash(new_pw)
+    new_pw_hashed = await hash_password(new_pw)
 
-    success = crud.change_password_org(org, new_pw_hashed)
+    success = await crud_async.change_password_org(org, new_pw_hashed)
 
     if success:
         msg = "Password updated successfully!"
         return templates.TemplateResponse("org/org_profile.html", {
             "request": request,
             "org": org,
+            "analytics": await crud_async.get_org_analytics(org),
             "success": msg
         })
     else:
@@ -138,5 +154,35 @@ async def change_password(request: Request, org = Depends(get_current_org), old_
         return templates.TemplateResponse("org/org_profile.html", {
             "request": request,
             "org": org,
+            "analytics": await crud_async.get_org_analytics(org),
             "failed": failed
-        })
\ No newline at end of file
+        })
+
+### --- Members (invited, then accepted by the user) --- ###
+@router.post("/org_invite_member", response_class=HTMLResponse)
+async def org_invite_member(request: Request, org = Depends(get_current_org), username: str = Form(...)):
+    if not org:
+        return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
+
+    success = await crud_async.invite_member_org(org, username.strip())
+    response = RedirectResponse(url="/org_profile", status_code=status.HTTP_303_SEE_OTHER)
+    if not success:
+        response.set_cookie(key="flash_error", value="User not found.")
+    return response
+
+@router.post("/org_remove_member", response_class=HTMLResponse)
+async def org_remove_member(request: Request, org = Depends(get_current_org), username: str = Form(...)):
+    # also cancels a pending invitation
+    if not org:
+        return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
+
+    await crud_async.remove_member_org(org, username)
+    return RedirectResponse(url="/org_profile", status_code=status.HTTP_303_SEE_OTHER)
+
+### --- Skill-gap analytics (JSON) --- ###
+@router.get("/api/org/analytics")
+async def org_analytics(org = Depends(get_current_org), top: int = Query(10, ge=1, le=100)):
+    if not org:
+        raise HTTPException(status_code=401, detail="Organization login required")
+
+    return await crud_async.get_org_analytics(org, top)
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException, Query
+import crud
+import crud_async
+
+router = APIRouter(prefix="/api/roles")
+
+def role_summary(role) -> dict:
+    return {"id": role.id, "title": role.title}
+
+### --- Title autocomplete (declared before /{role_id}) --- ###
+@router.get("/autocomplete")
+async def role_autocomplete(q: str = Query("", max_length=100), limit: int = Query(10, ge=1, le=50)):
+    # in-memory bisect on the prebuilt title index: cheap enough to run on every keystroke
+    await crud_async.catalog_ready()
+    return [role_summary(role) for role in crud.autocomplete_roles(q, limit)]
+
+### --- Role by ISCO code --- ###
+@router.get("/{role_id}")
+async def role_detail(role_id: str):
+    role = await crud_async.get_role_by_id(role_id)
+    if not role:
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    return role
+
+### --- Browse the ISCO hierarchy --- ###
+@router.get("/{role_id}/children")
+async def role_children(role_id: str):
+    if not await crud_async.get_role_by_id(role_id):
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    return [role_summary(role) for role in crud.get_role_children(role_id)]
+
+@router.get("/{role_id}/ancestors")
+async def role_ancestors(role_id: str):
+    if not await crud_async.get_role_by_id(role_id):
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    return [role_summary(role) for role in crud.get_role_ancestors(role_id)]
+
+@router.get("/{role_id}/siblings")
+async def role_siblings(role_id: str):
+    if not await crud_async.get_role_by_id(role_id):
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    return [role_summary(role) for role in crud.get_role_siblings(role_id)]
+
+### --- Roles with a similar description --- ###
+@router.get("/{role_id}/similar")
+async def role_similar(role_id: str, k: int = Query(5, ge=1, le=50)):
+    if not await crud_async.get_role_by_id(role_id):
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    return [{**role_summary(role), "score": score} for role, score in crud.get_similar_roles(role_id, k)]
+
+### --- Skill model of a role --- ###
+@router.get("/{role_id}/skills")
+async def role_skills(role_id: str):
+    if not await crud_async.get_role_by_id(role_id):
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    return crud.get_role_skills(role_id)
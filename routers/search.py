@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+import json
+from config import SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE
+import crud_async
+
+router = APIRouter(prefix="/api/search")
+
+### --- Paginated search, streamed as JSON --- ###
+@router.get("")
+async def search_roles(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    roles_list, total = await crud_async.extracting_skill_models_page(q.strip(), offset, limit)
+    next_offset = offset + len(roles_list) if offset + len(roles_list) < total else None
+
+    async def body():
+        # the envelope first, then one role at a time: nothing bigger than a role is ever buffered
+        yield f'{{"total": {total}, "offset": {offset}, "limit": {limit}, "next_offset": {json.dumps(next_offset)}, "results": ['
+        for i, role in enumerate(roles_list):
+            yield ("," if i else "") + role.model_dump_json()
+        yield "]}"
+
+    return StreamingResponse(body(), media_type="application/json")
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+import crud
+from routers.roles import role_summary
+
+router = APIRouter(prefix="/api/skills")
+
+### --- Roles requiring a skill (reverse index) --- ###
+@router.get("/{skill}/roles")
+async def skill_roles(skill: str):
+    return [role_summary(role) for role in crud.get_roles_for_skill(skill)]
@@ -4,8 +4,11 @@ from pydantic import EmailStr
 from typing import Optional
 from dependencies import get_current_user
 
-from config import templates, pwd_context
+from config import templates
+from fragments import render_search_results
+from security import hash_password, verify_password, verify_and_update
 import crud
+import crud_async
 from models import User, Role
 
 router = APIRouter()
@@ -25,14 +28,22 @@ async def user_login(request: Request):
 
 @router.post("/user_login", response_class=HTMLResponse)
 async def user_login(request: Request, username: str = Form(...), password: str = Form(...)):
-    user = crud.get_user(username)
+    user = await crud_async.get_user(username)
 
-    if not user or not pwd_context.verify(password, user.hashed_password):
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await verify_and_update(password, user.hashed_password)
+
+    if not verified:
         response = RedirectResponse(url="/user_login", status_code=status.HTTP_303_SEE_OTHER)
         
         response.set_cookie(key="flash_error", value="Invalid credentials. Please try again.")
         return response
 
+    # stored hash made with outdated Argon2 parameters: replacing it now that we know the password
+    if new_hash:
+        await crud_async.change_password_user(user, new_hash)
+
     response = RedirectResponse(url="/user_home", status_code=status.HTTP_303_SEE_OTHER)
 
     response.set_cookie(key="session_token", value=user.username, path="/", httponly=True, max_age=1800)  # 30 minutes session
@@ -76,10 +87,10 @@ async def register_user(
     username: str = Form(...), 
     password: str = Form(...)
 ):
-    hashed_pw = pwd_context.hash(password)
+    hashed_pw = await hash_password(password)
     new_user = User(name=name, surname=surname, email=email, username=username, hashed_password=hashed_pw)
     try:
-        crud.create_user(new_user)
+        await crud_async.create_user(new_user)
         return RedirectResponse(url="/user_login", status_code=status.HTTP_303_SEE_OTHER)
     except ValueError:
         return templates.TemplateResponse("user/user_register.html", {
@@ -98,7 +109,7 @@ async def user_profile(request: Request, user = Depends(get_current_user)):
 
     response = templates.TemplateResponse(
         "user/user_profile.html", 
-        {"request": request, "user": user}
+        {"request": request, "user": user, "gap": await crud_async.get_skill_gap(user)}
     )
 
     # No cache storage
@@ -111,24 +122,19 @@ async def user_profile(request: Request, user = Depends(get_current_user)):
 
 ### --- Obtain skills from User Input --- ###
 @router.post("/extract_skill_models", response_class=HTMLResponse)
-async def extract_skill_models(request: Request, search: str = Form(...), user = Depends(get_current_user)):
-    role = search.title().strip()
+async def extract_skill_models(request: Request, search: str = Form(...), page: int = Form(1), user = Depends(get_current_user)):
+    if not user:
+        return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
 
-    extracted_models = {}
+    # rendered result list, cached per query and page (see fragments.py)
+    results_html = await render_search_results(search, page, link_details=True)
 
-    skill_models_list = crud.extracting_skill_models(role)
-    if skill_models_list:
-        extracted_models[role] = skill_models_list
-    
-    if user:
-        return templates.TemplateResponse("user/user_home.html", {
-            "request": request,
-            "user": user,
-            "results": extracted_models,
-            "last_search": search
-        })
-    else:
-        return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
+    return templates.TemplateResponse("user/user_home.html", {
+        "request": request,
+        "user": user,
+        "results_html": results_html,
+        "last_search": search
+    })
     
 ### --- Set Target Roles --- ###
 @router.post("/set_target_roles", response_class=HTMLResponse)
@@ -147,36 +153,93 @@ async def set_target_roles(
     roles = [role1, role2, role3, role4, role5]
     target_roles = [role.title().strip() for role in roles if role and role.strip() != ""]
 
-    crud.set_target_roles_user(user, target_roles)
+    await crud_async.set_target_roles_user(user, target_roles)
     
     return templates.TemplateResponse("user/user_profile.html", {
         "request": request,
         "user": user,
+        "gap": await crud_async.get_skill_gap(user)
     })
 
+### --- Set declared Skills --- ###
+def parse_declared_skills(text: str) -> dict[str, int]:
+    # one skill per line, "Skill: level" (level 1-9, default 1)
+    skills = {}
+    for line in text.splitlines():
+        name, _, level = line.partition(":")
+        name = name.strip()
+        if not name:
+            continue
+        try:
+            skills[name] = max(1, min(9, int(level.strip())))
+        except ValueError:
+            skills[name] = 1
+    return skills
+
+@router.post("/set_skills", response_class=HTMLResponse)
+async def set_skills(request: Request, user = Depends(get_current_user), skills: str = Form("")):
+    if not user:
+        return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
+
+    await crud_async.set_skills_user(user, parse_declared_skills(skills))
+
+    return templates.TemplateResponse("user/user_profile.html", {
+        "request": request,
+        "user": user,
+        "gap": await crud_async.get_skill_gap(user)
+    })
+
+### --- Organization invitations --- ###
+# the user's target roles and skills reach an organization's analytics only after accepting
+@router.post("/accept_invitation", response_class=HTMLResponse)
+async def accept_invitation(request: Request, user = Depends(get_current_user), orgname: str = Form(...)):
+    if not user:
+        return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
+
+    await crud_async.accept_invitation_user(user, orgname)
+    return RedirectResponse(url="/user_profile", status_code=status.HTTP_303_SEE_OTHER)
+
+@router.post("/decline_invitation", response_class=HTMLResponse)
+async def decline_invitation(request: Request, user = Depends(get_current_user), orgname: str = Form(...)):
+    if not user:
+        return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
+
+    await crud_async.decline_invitation_user(user, orgname)
+    return RedirectResponse(url="/user_profile", status_code=status.HTTP_303_SEE_OTHER)
+
+@router.post("/leave_organization", response_class=HTMLResponse)
+async def leave_organization(request: Request, user = Depends(get_current_user), orgname: str = Form(...)):
+    if not user:
+        return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
+
+    await crud_async.leave_organization_user(user, orgname)
+    return RedirectResponse(url="/user_profile", status_code=status.HTTP_303_SEE_OTHER)
+
 ### --- Password Change --- ###
 @router.post("/change_password_user", response_class=HTMLResponse)
 async def change_password(request: Request, user = Depends(get_current_user), old_pw: str = Form(...), new_pw: str = Form(...)):
     if not user:
         return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
     
-    if not pwd_context.verify(old_pw, user.hashed_password):
+    if not await verify_password(old_pw, user.hashed_password):
         error = "Your old password is not correct."
         return templates.TemplateResponse("user/user_profile.html", {
             "request": request,
             "user": user,
+            "gap": await crud_async.get_skill_gap(user),
             "wrong_pw": error
         })
     
-    new_pw_hashed = pwd_context.hash(new_pw)
+    new_pw_hashed = await hash_password(new_pw)
 
-    success = crud.change_password_user(user, new_pw_hashed)
+    success = await crud_async.change_password_user(user, new_pw_hashed)
 
     if success:
         msg = "Password updated successfully!"
         return templates.TemplateResponse("user/user_profile.html", {
             "request": request,
             "user": user,
+            "gap": await crud_async.get_skill_gap(user),
             "success": msg
         })
     else:
@@ -184,6 +247,7 @@ async def change_password(request: Request, user = Depends(get_current_user), ol
         return templates.TemplateResponse("user/user_profile.html", {
             "request": request,
             "user": user,
+            "gap": await crud_async.get_skill_gap(user),
             "failed": failed
         })
     
@@ -193,7 +257,7 @@ async def details_page(request: Request, role_id: str, user = Depends(get_curren
     if not user:
         return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
     
-    role_object = crud.get_role_by_id(role_id)
+    role_object = await crud_async.get_role_by_id(role_id)
 
     if not role_object:
         error = "Skill Model not found"
@@ -206,6 +270,11 @@ async def details_page(request: Request, role_id: str, user = Depends(get_curren
     return templates.TemplateResponse("user/details.html", {
         "request": request,
         "user": user,
-        "role": role_object
+        "role": role_object,
+        "skills": crud.get_role_skills(role_id),
+        "ancestors": crud.get_role_ancestors(role_id),
+        "children": crud.get_role_children(role_id),
+        "siblings": crud.get_role_siblings(role_id),
+        "similar": crud.get_similar_roles(role_id)
     })
     
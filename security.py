@@ -0,0 +1,51 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+from config import pwd_context, HASH_WORKERS, HASH_QUEUE_LIMIT
+from metrics import timed
+
+# Argon2 (argon2-cffi) releases the GIL while hashing, so a thread pool is enough
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="argon2")
+
+# hashing calls running or waiting for a worker (only touched from the event loop)
+_pending = 0
+
+async def _run(func, *args):
+    global _pending
+
+    if _pending >= HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please try again.",
+            headers={"Retry-After": "1"}
+        )
+
+    _pending += 1
+    try:
+        with timed(f"hashing.{func.__name__}"):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_executor, func, *args)
+    finally:
+        _pending -= 1
+
+### --- Async wrappers around pwd_context --- ###
+async def hash_password(password: str) -> str:
+    return await _run(pwd_context.hash, password)
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await _run(pwd_context.verify, password, hashed_password)
+
+async def verify_and_update(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verifies the password and, when the stored hash uses outdated Argon2 parameters
+    (needs_update), also returns a fresh hash to be saved.
+    """
+    return await _run(pwd_context.verify_and_update, password, hashed_password)
+
+def pending_hashes() -> int:
+    return _pending
+
+async def warm_up():
+    # the first Argon2 call loads the argon2-cffi backend and starts a pool thread: paid at startup, not by the first login
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_executor, pwd_context.hash, "warm-up")
@@ -0,0 +1,94 @@
+import numpy as np
+from models import SkillGap, RoleGap, MissingSkill, SkillGapReport
+from skills.store import SkillStore, normalize_skill
+
+### --- Roles x skills requirement matrix --- ###
+class SkillMatrix:
+    """
+    Dense float32 matrix, one row per role of the skill store and one column per skill of
+    the shared vocabulary (normalized names); cell = required level, 0 = not required.
+    """
+    def __init__(self, store: SkillStore):
+        self.store = store
+        self.vocabulary = sorted(store.by_skill)
+        self.columns = {skill: j for j, skill in enumerate(self.vocabulary)}
+        self.role_ids = sorted(store.by_role)
+        self.rows = {role_id: i for i, role_id in enumerate(self.role_ids)}
+
+        self.required = np.zeros((len(self.role_ids), len(self.vocabulary)), dtype=np.float32)
+        for role_id, requirements in store.by_role.items():
+            i = self.rows[role_id]
+            for requirement in requirements:
+                self.required[i, self.columns[normalize_skill(requirement.skill)]] = requirement.level
+
+    def user_vector(self, declared: dict[str, int] | None) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for name, level in (declared or {}).items():
+            j = self.columns.get(normalize_skill(name))
+            if j is not None:
+                vector[j] = max(vector[j], level)
+        return vector
+
+    def skill_name(self, j: int) -> str:
+        return self.store.skill_names[self.vocabulary[j]]
+
+_matrix: SkillMatrix | None = None
+
+def get_skill_matrix(store: SkillStore) -> SkillMatrix:
+    # rebuilt only when the skill store itself was reloaded
+    global _matrix
+
+    if _matrix is None or _matrix.store is not store:
+        _matrix = SkillMatrix(store)
+    return _matrix
+
+### --- Gap analysis for one user --- ###
+def analyse_gaps(matrix: SkillMatrix, role_ids: list[str], titles: dict[str, str],
+                 declared: dict[str, int] | None, top_n: int = 10) -> SkillGapReport:
+    """
+    All the target roles at once: R (roles x skills) minus the user vector u, clipped at 0,
+    gives every per-skill gap; coverage and the ranked missing skills are row/column sums.
+    """
+    role_ids = [role_id for role_id in role_ids if role_id in matrix.rows]
+    if not role_ids:
+        return SkillGapReport(roles=[], missing_skills=[], overall_coverage=0.0)
+
+    required = matrix.required[[matrix.rows[role_id] for role_id in role_ids]] # k x V
+    current = matrix.user_vector(declared)                                     # V
+    gaps = np.clip(required - current, 0, None)                                # k x V
+
+    required_total = required.sum(axis=1)
+    gap_total = gaps.sum(axis=1)
+    coverage = np.divide(required_total - gap_total, required_total,
+                         out=np.ones_like(required_total), where=required_total > 0)
+
+    roles = []
+    for i, role_id in enumerate(role_ids):
+        columns = np.flatnonzero(gaps[i])
+        columns = columns[np.argsort(-gaps[i, columns], kind="stable")]
+        roles.append(RoleGap(
+            role_id=role_id,
+            title=titles.get(role_id, role_id),
+            coverage=round(float(coverage[i]), 3),
+            gaps=[
+                SkillGap(skill=matrix.skill_name(j), required=int(required[i, j]),
+                         current=int(current[j]), gap=int(gaps[i, j]))
+                for j in columns
+            ]
+        ))
+
+    # ranking across every target role: biggest summed gap first, then the most needed
+    skill_gap = gaps.sum(axis=0)
+    roles_needing = (gaps > 0).sum(axis=0)
+    max_required = required.max(axis=0)
+    candidates = np.flatnonzero(skill_gap)
+    order = candidates[np.lexsort((-roles_needing[candidates], -skill_gap[candidates]))][:top_n]
+
+    missing = [
+        MissingSkill(skill=matrix.skill_name(j), total_gap=int(skill_gap[j]),
+                     max_required=int(max_required[j]), roles=int(roles_needing[j]))
+        for j in order
+    ]
+
+    overall = float((required_total.sum() - gap_total.sum()) / required_total.sum()) if required_total.sum() else 1.0
+    return SkillGapReport(roles=roles, missing_skills=missing, overall_coverage=round(overall, 3))
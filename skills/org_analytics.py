@@ -0,0 +1,192 @@
+import threading
+import numpy as np
+from models import User, OrgSkillGap, OrgRoleGap, OrgHeatmap, OrgAnalytics
+from skills.gap import SkillMatrix
+
+# members processed per numpy block: bounds the temporary int16 arrays to a few MB
+CHUNK_ROWS = 2048
+
+### --- Members x skills matrices of one organization --- ###
+class OrgSnapshot:
+    """
+    One row per member: declared proficiency and required level (max over the member's
+    target roles), both uint8 over the skill vocabulary. Built once from the member
+    profiles, then updated row by row when a single profile changes.
+    """
+    def __init__(self, orgname: str, matrix: SkillMatrix, catalog, users: list[User], cursor: int = 0):
+        self.orgname = orgname
+        self.matrix = matrix
+        self.catalog = catalog
+        self.cursor = cursor # position in the organization's change log the rows are up to date with
+        size = len(matrix.vocabulary)
+
+        # matrix rows of each target role title: members share a few hundred titles at most
+        self._title_rows: dict[str, list[int]] = {}
+
+        self.usernames: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.targets: list[list[int]] = [] # matrix rows of each member's target roles
+        self.proficiency = np.zeros((len(users), size), dtype=np.uint8)
+        self.requirement = np.zeros((len(users), size), dtype=np.uint8)
+
+        for i, user in enumerate(users):
+            self.usernames.append(user.username.lower())
+            self.rows[user.username.lower()] = i
+            self.targets.append([])
+            self._fill(i, user)
+
+    def _role_rows(self, title: str) -> list[int]:
+        rows = self._title_rows.get(title)
+        if rows is None:
+            rows = [
+                self.matrix.rows[role_id]
+                for role_id in self.catalog.ids_for_titles([title])
+                if role_id in self.matrix.rows
+            ]
+            self._title_rows[title] = rows
+        return rows
+
+    def _fill(self, i: int, user: User):
+        self.proficiency[i] = self.matrix.user_vector(user.skills)
+        role_rows = list(dict.fromkeys(row for title in user.target_roles or [] for row in self._role_rows(title)))
+        self.targets[i] = role_rows
+        self.requirement[i] = self.matrix.required[role_rows].max(axis=0) if role_rows else 0
+
+    def update(self, user: User):
+        key = user.username.lower()
+        if key not in self.rows:
+            # new member: one extra row (rare compared with profile updates)
+            self.rows[key] = len(self.usernames)
+            self.usernames.append(key)
+            self.targets.append([])
+            self.proficiency = np.vstack([self.proficiency, np.zeros((1, self.proficiency.shape[1]), dtype=np.uint8)])
+            self.requirement = np.vstack([self.requirement, np.zeros((1, self.requirement.shape[1]), dtype=np.uint8)])
+        self._fill(self.rows[key], user)
+
+    def remove(self, username: str):
+        key = username.lower()
+        i = self.rows.pop(key, None)
+        if i is None:
+            return
+        del self.usernames[i]
+        del self.targets[i]
+        self.proficiency = np.delete(self.proficiency, i, axis=0)
+        self.requirement = np.delete(self.requirement, i, axis=0)
+        self.rows = {name: row for row, name in enumerate(self.usernames)}
+
+    def apply(self, usernames: list[str], members: list[User]):
+        # replayed changes: each user's row is recomputed, or dropped if no longer a member
+        current = {user.username.lower(): user for user in members}
+        for key in dict.fromkeys(username.lower() for username in usernames):
+            if key in current:
+                self.update(current[key])
+            else:
+                self.remove(key)
+
+    def analytics(self, top_skills: int = 10, top_roles: int = 10) -> OrgAnalytics:
+        members, size = self.proficiency.shape
+        with_targets = sum(1 for rows in self.targets if rows)
+
+        # org-wide gaps: one pass over the member matrix, block by block
+        total_gap = np.zeros(size, dtype=np.int64)
+        members_with_gap = np.zeros(size, dtype=np.int64)
+        for start in range(0, members, CHUNK_ROWS):
+            gaps = np.clip(
+                self.requirement[start:start + CHUNK_ROWS].astype(np.int16) - self.proficiency[start:start + CHUNK_ROWS],
+                0, None
+            )
+            total_gap += gaps.sum(axis=0)
+            members_with_gap += (gaps > 0).sum(axis=0)
+
+        candidates = np.flatnonzero(total_gap)
+        skill_columns = candidates[np.lexsort((-members_with_gap[candidates], -total_gap[candidates]))][:top_skills]
+        top_gaps = [self._skill_gap(j, total_gap[j], members_with_gap[j], with_targets) for j in skill_columns]
+
+        # per role: members targeting it against the role's own requirements
+        role_members: dict[int, list[int]] = {}
+        for member, role_rows in enumerate(self.targets):
+            for role_row in role_rows:
+                role_members.setdefault(role_row, []).append(member)
+        popular = sorted(role_members, key=lambda r: (-len(role_members[r]), self.matrix.role_ids[r]))[:top_roles]
+
+        role_gaps = []
+        heatmap_values = []
+        for role_row in popular:
+            idx = role_members[role_row]
+            required = self.matrix.required[role_row].astype(np.int16)
+            gaps = np.clip(required - self.proficiency[idx], 0, None) # members x skills
+            role_total = gaps.sum(axis=0)
+            role_count = (gaps > 0).sum(axis=0)
+            required_sum = float(required.sum()) * len(idx)
+            coverage = 1.0 - float(role_total.sum()) / required_sum if required_sum else 1.0
+
+            columns = np.flatnonzero(role_total)
+            columns = columns[np.argsort(-role_total[columns], kind="stable")][:top_skills]
+            role_id = self.matrix.role_ids[role_row]
+            role = self.catalog.get_role(role_id)
+            role_gaps.append(OrgRoleGap(
+                role_id=role_id,
+                title=role.title if role else role_id,
+                members=len(idx),
+                coverage=round(coverage, 3),
+                top_gaps=[self._skill_gap(j, role_total[j], role_count[j], len(idx)) for j in columns]
+            ))
+            heatmap_values.append([round(float(role_total[j]) / len(idx), 2) for j in skill_columns])
+
+        return OrgAnalytics(
+            members=members,
+            members_with_targets=with_targets,
+            top_gaps=top_gaps,
+            role_gaps=role_gaps,
+            heatmap=OrgHeatmap(
+                roles=[gap.title for gap in role_gaps],
+                skills=[self.matrix.skill_name(j) for j in skill_columns],
+                values=heatmap_values
+            )
+        )
+
+    def _skill_gap(self, j: int, total, count, population: int) -> OrgSkillGap:
+        return OrgSkillGap(
+            skill=self.matrix.skill_name(j),
+            total_gap=int(total),
+            members=int(count),
+            mean_gap=round(float(total) / population, 2) if population else 0.0
+        )
+
+### --- Snapshots shared by the requests --- ###
+_snapshots: dict[str, OrgSnapshot] = {}
+_lock = threading.Lock()
+
+def get_analytics(orgname: str, matrix: SkillMatrix, catalog, load_members, event_cursor, read_changes,
+                  top_skills: int = 10, top_roles: int = 10) -> OrgAnalytics:
+    """
+    load_members(usernames=None) -> list[User]: the members among usernames (all of them with None).
+    read_changes(cursor) -> (usernames, cursor) | None: users whose membership or profile changed
+    since cursor, in any worker (None: the log no longer reaches back, rebuild).
+    Only the changed users are read again; the whole organization only the first time, after the
+    skill models / catalog were reloaded, or when the change log was trimmed.
+    """
+    key = orgname.lower()
+    # computed under the lock: applying changes replaces the matrices and renumbers the rows
+    with _lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is not None and (snapshot.matrix is not matrix or snapshot.catalog is not catalog):
+            snapshot = None
+
+        if snapshot is not None:
+            changes = read_changes(snapshot.cursor)
+            if changes is None:
+                snapshot = None
+            elif changes[0]:
+                usernames, snapshot.cursor = changes
+                snapshot.apply(usernames, load_members(usernames))
+            else:
+                snapshot.cursor = changes[1]
+
+        if snapshot is None:
+            # cursor taken before reading the members: changes made meanwhile are replayed next time
+            cursor = event_cursor()
+            snapshot = OrgSnapshot(orgname, matrix, catalog, load_members(), cursor)
+            _snapshots[key] = snapshot
+
+        return snapshot.analytics(top_skills, top_roles)
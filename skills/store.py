@@ -0,0 +1,97 @@
+import json
+import os
+import re
+import threading
+from models import SkillRequirement
+
+SKILL_MODELS_FILE = "skill_models.json" # produced by llm/skill_models.py
+
+def normalize_skill(name: str) -> str:
+    # "Project  Management", "project-management" and "Project management." are the same skill
+    return " ".join(re.findall(r"[a-z0-9+#]+", name.lower()))
+
+def _level(value) -> int:
+    try:
+        return max(1, min(9, int(value)))
+    except (TypeError, ValueError):
+        return 1
+
+### --- Skill models served at runtime --- ###
+class SkillStore:
+    """
+    skill_models.json indexed two ways:
+    - ISCO id -> skill requirements of the role,
+    - normalized skill name -> ISCO ids of the roles needing it (reverse index).
+    """
+    def __init__(self, data: dict[str, list[dict]], mtime: float | None):
+        self.mtime = mtime
+        self.by_role: dict[str, list[SkillRequirement]] = {}
+        self.by_skill: dict[str, list[str]] = {}
+        self.skill_names: dict[str, str] = {} # normalized -> first display name seen
+
+        for role_id, records in data.items():
+            requirements: dict[str, SkillRequirement] = {}
+            for record in records:
+                name = (record.get("Skill") or "").strip()
+                key = normalize_skill(name)
+                if not key:
+                    continue
+
+                requirement = SkillRequirement(
+                    skill=self.skill_names.setdefault(key, name),
+                    level=_level(record.get("Required Level")),
+                    reason=record.get("Reason") or ""
+                )
+                # same skill listed twice for a role: keeping the higher level
+                if key not in requirements or requirement.level > requirements[key].level:
+                    requirements[key] = requirement
+
+            role_id = str(role_id).strip()
+            self.by_role[role_id] = sorted(requirements.values(), key=lambda r: (-r.level, r.skill))
+            for key in requirements:
+                self.by_skill.setdefault(key, []).append(role_id)
+
+        for role_ids in self.by_skill.values():
+            role_ids.sort()
+
+    def role_skills(self, role_id: str) -> list[SkillRequirement]:
+        return self.by_role.get(str(role_id).strip(), [])
+
+    def roles_for_skill(self, skill: str) -> list[str]:
+        return self.by_skill.get(normalize_skill(skill), [])
+
+_store: SkillStore | None = None
+_lock = threading.Lock()
+
+def load_skill_store(path: str = SKILL_MODELS_FILE) -> SkillStore:
+    global _store
+
+    with _lock:
+        if not os.path.exists(path):
+            # skill models not generated yet: empty store, details pages just show no skills
+            _store = SkillStore({}, None)
+            return _store
+
+        mtime = os.path.getmtime(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        _store = SkillStore(data, mtime)
+        return _store
+
+def current_skill_store(path: str = SKILL_MODELS_FILE) -> SkillStore | None:
+    # the loaded store if skill_models.json did not change since, None when a reload is due (never loads)
+    current = _store
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+
+    return current if current is not None and current.mtime == mtime else None
+
+def get_skill_store(path: str = SKILL_MODELS_FILE) -> SkillStore:
+    """
+    Returns the shared store, reloading it only when skill_models.json changed (or appeared).
+    """
+    current = current_skill_store(path)
+    if current is not None:
+        return current
+
+    return load_skill_store(path)
@@ -0,0 +1,29 @@
+import threading
+from config import STORAGE_BACKEND, SQLITE_PATH
+from storage.base import StorageBackend
+
+_backend: StorageBackend | None = None
+_lock = threading.Lock()
+
+def create_backend(name: str = STORAGE_BACKEND) -> StorageBackend:
+    if name == "json":
+        from storage.json_files import JsonFileBackend
+        return JsonFileBackend()
+
+    if name == "sqlite":
+        from storage.sqlite_db import SqliteBackend
+        return SqliteBackend(SQLITE_PATH)
+
+    raise ValueError(f"Unknown storage backend: {name}")
+
+def get_backend() -> StorageBackend:
+    """
+    Backend chosen with STORAGE_BACKEND ("json" or "sqlite"), created on first use.
+    """
+    global _backend
+
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
@@ -0,0 +1,77 @@
+from abc import ABC, abstractmethod
+
+# kinds of accounts handled by every backend
+USERS = "users"
+ORGANIZATIONS = "organizations"
+
+def normalize_key(name: str) -> str:
+    # usernames / orgnames are case-insensitive
+    return name.lower().strip()
+
+def merge_lists(data: dict, add: dict[str, list[str]], remove: dict[str, list[str]]):
+    # list fields of account names (members, invitations...): compared case-insensitively, no duplicates
+    for field in set(add) | set(remove):
+        dropped = {name.lower() for name in remove.get(field, [])}
+        names = [name for name in data.get(field) or [] if name.lower() not in dropped]
+        for name in add.get(field, []):
+            if name.lower() not in (other.lower() for other in names):
+                names.append(name)
+        data[field] = names
+
+### --- Storage backend interface --- ###
+class StorageBackend(ABC):
+    """
+    Where crud keeps accounts. Records are plain dicts (the Pydantic model_dump),
+    identified by kind (USERS / ORGANIZATIONS) and by username / orgname.
+    """
+
+    @abstractmethod
+    def get(self, kind: str, name: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    def create(self, kind: str, name: str, data: dict):
+        """Raises ValueError if the account already exists."""
+
+    @abstractmethod
+    def update(self, kind: str, name: str, fields: dict) -> bool:
+        """Merges fields into the stored record. Returns False if the account does not exist."""
+
+    @abstractmethod
+    def update_lists(self, kind: str, name: str, add: dict[str, list[str]] | None = None,
+                     remove: dict[str, list[str]] | None = None) -> dict | None:
+        """
+        Adds / removes names in list fields of the stored record, atomically: concurrent
+        changes to the same lists (from any process) are not overwritten.
+        Returns the updated record, None if the account does not exist.
+        """
+
+    @abstractmethod
+    def exists(self, kind: str, name: str) -> bool:
+        ...
+
+    @abstractmethod
+    def all(self, kind: str) -> list[dict]:
+        ...
+
+    def get_many(self, kind: str, names: list[str]) -> list[dict]:
+        """Bulk read: records of the existing accounts among names (missing ones are skipped)."""
+        records = (self.get(kind, name) for name in names)
+        return [record for record in records if record is not None]
+
+    # Append-only change log of one account, shared by every process using the same storage:
+    # a process remembers its cursor and only reads what was appended after it.
+    @abstractmethod
+    def append_event(self, kind: str, name: str, event: dict):
+        ...
+
+    @abstractmethod
+    def event_cursor(self, kind: str, name: str) -> int:
+        """Position right after the last event."""
+
+    @abstractmethod
+    def read_events(self, kind: str, name: str, cursor: int) -> tuple[list[dict], int] | None:
+        """Events appended after cursor and the new cursor; None if the log no longer goes back to cursor."""
+
+    def close(self):
+        pass
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from storage.base import StorageBackend, USERS, ORGANIZATIONS, normalize_key, merge_lists
+
+try:
+    import fcntl # optional (not on Windows): without it writes are only serialized within one process
+except ImportError:
+    fcntl = None
+
+DATA_DIRS = {USERS: "data/users", ORGANIZATIONS: "data/organizations"}
+
+### --- One JSON file per account (data/users, data/organizations) --- ###
+class JsonFileBackend(StorageBackend):
+    def __init__(self, data_dirs: dict[str, str] = DATA_DIRS):
+        self.data_dirs = data_dirs
+        self._write_lock = threading.Lock() # read-modify-write of update() is not atomic
+        for folder in self.data_dirs.values():
+            os.makedirs(folder, exist_ok=True)
+
+    def path(self, kind: str, name: str) -> str:
+        return os.path.join(self.data_dirs[kind], f"{normalize_key(name)}.json")
+
+    def get(self, kind: str, name: str) -> dict | None:
+        path = self.path(kind, name)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def create(self, kind: str, name: str, data: dict):
+        path = self.path(kind, name)
+        if os.path.exists(path):
+            raise ValueError(f"{kind[:-1].capitalize()} already exists")
+
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+    @contextmanager
+    def _locked(self, kind: str):
+        # threads of this process, then the other workers (one lock file per folder)
+        with self._write_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.data_dirs[kind], ".lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self, path: str) -> dict:
+        with open(path, "r") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return {} # Managing empty file
+
+    def update(self, kind: str, name: str, fields: dict) -> bool:
+        path = self.path(kind, name)
+        if not os.path.exists(path):
+            return False
+
+        with self._locked(kind):
+            data = self._read(path)
+            data.update(fields)
+            self._write(path, data)
+
+        return True
+
+    def update_lists(self, kind: str, name: str, add: dict[str, list[str]] | None = None,
+                     remove: dict[str, list[str]] | None = None) -> dict | None:
+        path = self.path(kind, name)
+        if not os.path.exists(path):
+            return None
+
+        with self._locked(kind):
+            data = self._read(path)
+            merge_lists(data, add or {}, remove or {})
+            self._write(path, data)
+
+        return data
+
+    def _write(self, path: str, data: dict):
+        # written aside then renamed: a concurrent get() never reads a half-written file
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, path)
+
+    def exists(self, kind: str, name: str) -> bool:
+        return os.path.exists(self.path(kind, name))
+
+    def get_many(self, kind: str, names: list[str]) -> list[dict]:
+        records = []
+        for name in names:
+            try:
+                with open(self.path(kind, name), "r") as f:
+                    records.append(json.load(f))
+            except FileNotFoundError:
+                continue
+        return records
+
+    ### --- Change log: <name>.events.jsonl next to the record, cursor = byte offset --- ###
+    def events_path(self, kind: str, name: str) -> str:
+        return os.path.join(self.data_dirs[kind], f"{normalize_key(name)}.events.jsonl")
+
+    def append_event(self, kind: str, name: str, event: dict):
+        # one write in append mode per line: whole lines even with several processes appending
+        with self._write_lock, open(self.events_path(kind, name), "a") as f:
+            f.write(json.dumps(event) + "\n")
+
+    def event_cursor(self, kind: str, name: str) -> int:
+        path = self.events_path(kind, name)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def read_events(self, kind: str, name: str, cursor: int) -> tuple[list[dict], int] | None:
+        path = self.events_path(kind, name)
+        if not os.path.exists(path):
+            return ([], 0) if cursor == 0 else None
+
+        with open(path, "rb") as f:
+            if cursor > f.seek(0, os.SEEK_END):
+                return None # log deleted and started again
+            f.seek(cursor)
+            data = f.read()
+
+        # a line still being written is left for the next read
+        end = data.rfind(b"\n") + 1
+        return [json.loads(line) for line in data[:end].splitlines() if line.strip()], cursor + end
+
+    def all(self, kind: str) -> list[dict]:
+        records = []
+        folder = self.data_dirs[kind]
+        for file_name in sorted(os.listdir(folder)):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(folder, file_name), "r") as f:
+                    records.append(json.load(f))
+            except json.JSONDecodeError as e:
+                print(f"Skipping {file_name}: {e}")
+        return records
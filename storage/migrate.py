@@ -0,0 +1,25 @@
+import sys
+from storage.base import USERS, ORGANIZATIONS
+from storage.json_files import JsonFileBackend
+from storage.sqlite_db import SqliteBackend
+from config import SQLITE_PATH
+
+### --- Import data/users/*.json and data/organizations/*.json into SQLite --- ###
+# Usage: python -m storage.migrate [path/to/database.db]
+# Safe to run again: existing accounts are replaced with the JSON version.
+
+def migrate(db_path: str = SQLITE_PATH) -> dict[str, int]:
+    source = JsonFileBackend()
+    target = SqliteBackend(db_path)
+
+    try:
+        return {kind: target.import_records(kind, source.all(kind)) for kind in (USERS, ORGANIZATIONS)}
+    finally:
+        target.close()
+
+if __name__ == "__main__":
+    db_path = sys.argv[1] if len(sys.argv) > 1 else SQLITE_PATH
+    counts = migrate(db_path)
+
+    print(f"Imported {counts[USERS]} users and {counts[ORGANIZATIONS]} organizations into {db_path}")
+    print("Start the server with STORAGE_BACKEND=sqlite to use it.")
@@ -0,0 +1,186 @@
+import json
+import os
+import sqlite3
+import threading
+from storage.base import StorageBackend, USERS, ORGANIZATIONS, normalize_key, merge_lists
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    email TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_email ON users(email);
+
+CREATE TABLE IF NOT EXISTS organizations (
+    orgname TEXT PRIMARY KEY,
+    email TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS organizations_email ON organizations(email);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_name ON events(kind, name, id);
+"""
+
+# change-log rows kept (all accounts together); older ones are trimmed, a reader behind them rebuilds
+EVENTS_KEEP = 100_000
+
+KEY_COLUMNS = {USERS: "username", ORGANIZATIONS: "orgname"}
+
+### --- SQLite storage (WAL mode) --- ###
+class SqliteBackend(StorageBackend):
+    """
+    Accounts stored as JSON documents in SQLite, primary key on the name and a secondary
+    index on email. WAL lets readers run while a writer commits; each thread gets its own
+    connection.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # autocommit mode: transactions are opened explicitly with BEGIN
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, kind: str, name: str) -> dict | None:
+        row = self._conn().execute(
+            f"SELECT data FROM {kind} WHERE {KEY_COLUMNS[kind]} = ?", (normalize_key(name),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def create(self, kind: str, name: str, data: dict):
+        try:
+            self._conn().execute(
+                f"INSERT INTO {kind} ({KEY_COLUMNS[kind]}, email, data) VALUES (?, ?, ?)",
+                (normalize_key(name), data.get("email"), json.dumps(data))
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"{kind[:-1].capitalize()} already exists")
+
+    def _modify(self, kind: str, name: str, change) -> dict | None:
+        conn = self._conn()
+        key = normalize_key(name)
+
+        # read-modify-write in one transaction, so concurrent updates cannot lose fields
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(f"SELECT data FROM {kind} WHERE {KEY_COLUMNS[kind]} = ?", (key,)).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+
+            data = json.loads(row[0])
+            change(data)
+            conn.execute(
+                f"UPDATE {kind} SET email = ?, data = ? WHERE {KEY_COLUMNS[kind]} = ?",
+                (data.get("email"), json.dumps(data), key)
+            )
+            conn.execute("COMMIT")
+            return data
+
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update(self, kind: str, name: str, fields: dict) -> bool:
+        return self._modify(kind, name, lambda data: data.update(fields)) is not None
+
+    def update_lists(self, kind: str, name: str, add: dict[str, list[str]] | None = None,
+                     remove: dict[str, list[str]] | None = None) -> dict | None:
+        return self._modify(kind, name, lambda data: merge_lists(data, add or {}, remove or {}))
+
+    def exists(self, kind: str, name: str) -> bool:
+        row = self._conn().execute(
+            f"SELECT 1 FROM {kind} WHERE {KEY_COLUMNS[kind]} = ?", (normalize_key(name),)
+        ).fetchone()
+        return row is not None
+
+    def all(self, kind: str) -> list[dict]:
+        rows = self._conn().execute(f"SELECT data FROM {kind} ORDER BY {KEY_COLUMNS[kind]}").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_many(self, kind: str, names: list[str]) -> list[dict]:
+        keys = [normalize_key(name) for name in names]
+        records = []
+        # bounded number of bound parameters per statement
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._conn().execute(
+                f"SELECT data FROM {kind} WHERE {KEY_COLUMNS[kind]} IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            records.extend(json.loads(row[0]) for row in rows)
+        return records
+
+    ### --- Change log: one events table, cursor = last event id --- ###
+    def append_event(self, kind: str, name: str, event: dict):
+        conn = self._conn()
+        event_id = conn.execute(
+            "INSERT INTO events (kind, name, data) VALUES (?, ?, ?)", (kind, normalize_key(name), json.dumps(event))
+        ).lastrowid
+        if event_id % 1000 == 0:
+            conn.execute("DELETE FROM events WHERE id <= ?", (event_id - EVENTS_KEEP,))
+
+    def event_cursor(self, kind: str, name: str) -> int:
+        return self._conn().execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+    def read_events(self, kind: str, name: str, cursor: int) -> tuple[list[dict], int] | None:
+        conn = self._conn()
+        oldest, last = conn.execute("SELECT MIN(id), COALESCE(MAX(id), 0) FROM events").fetchone()
+        if oldest is not None and cursor < oldest - 1:
+            return None # trimmed past the cursor
+
+        # bounded by the last id read above: whatever is appended meanwhile comes with the next read
+        rows = conn.execute(
+            "SELECT data FROM events WHERE kind = ? AND name = ? AND id > ? AND id <= ? ORDER BY id",
+            (kind, normalize_key(name), cursor, last)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows], max(cursor, last)
+
+    def import_records(self, kind: str, records: list[dict]) -> int:
+        """
+        Bulk insert (or replace) in a single transaction. Used by the migration command.
+        """
+        conn = self._conn()
+        key_column = KEY_COLUMNS[kind]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {kind} ({key_column}, email, data) VALUES (?, ?, ?)",
+                [(normalize_key(r[key_column]), r.get("email"), json.dumps(r)) for r in records]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(records)
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()